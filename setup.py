@@ -28,7 +28,7 @@ setup(
     author_email="info@example.com",
     url="https://github.com/user/hermes-ingestor",
     packages=find_packages(),
-    python_requires=">=3.8",
+    python_requires=">=3.9",
     install_requires=requirements,
     entry_points={
         "console_scripts": [
@@ -40,7 +40,6 @@ setup(
         "Intended Audience :: Developers",
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
     ],
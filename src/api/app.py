@@ -4,12 +4,15 @@ Main FastAPI application.
 
 import logging
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from . import routes
+from .middleware import RateLimitMiddleware, UploadSizeLimitMiddleware, rate_limiter
 from ..config import settings
+from ..utils.audit import audit_logger
 from .. import __version__
 
 # Configure logging
@@ -18,16 +21,53 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up shared resources once per worker process."""
+    # Build the OpenAPI schema now rather than on the first /openapi.json request
+    if app.openapi_url:
+        app.openapi()
+    audit_logger.start()
+    await rate_limiter.connect(settings.redis_url)
+    rate_limiter.start()
+    routes.start_ingest_pool()
+    await routes.warm_up()
+    try:
+        yield
+    finally:
+        routes.stop_ingest_pool()
+        await rate_limiter.stop()
+        await rate_limiter.close()
+        await audit_logger.stop()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Hermes Ingestor API",
     description="API for document ingestion and embedding for knowledge bases",
     version=__version__,
-    docs_url="/docs",
-    redoc_url="/redoc"
+    docs_url="/docs" if settings.enable_docs else None,
+    redoc_url="/redoc" if settings.enable_docs else None,
+    openapi_url="/openapi.json" if settings.enable_docs else None,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
+
+# Add rate limiting middleware; health probes are not counted
+app.add_middleware(RateLimitMiddleware, exempt_paths=["/api/health"])
+
+# Reject oversized single-file uploads before their body is read, leaving
+# headroom for multipart boundaries and the metadata field
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    paths=["/api/ingest/file"],
+    max_bytes=settings.max_file_size_mb * 1024 * 1024 + (1 << 20),
 )
 
-# Add CORS middleware
+# Add CORS middleware last, so it is the outermost layer: 429 and 413
+# responses from the middleware above carry CORS headers, and preflight
+# requests are answered before they count against the rate limit
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Update for production
@@ -37,6 +77,7 @@ app.add_middleware(
 )
 
 # Include API routes
+app.include_router(routes.health_router, prefix="/api")
 app.include_router(routes.router, prefix="/api")
 
 
@@ -45,7 +86,7 @@ app.include_router(routes.router, prefix="/api")
 async def global_exception_handler(request: Request, exc: Exception):
     """Handle all unhandled exceptions."""
     logging.error(f"Unhandled exception: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": f"Internal server error: {str(exc)}"}
     )
@@ -58,6 +99,6 @@ async def root():
     return {
         "service": "Hermes Ingestor",
         "version": __version__,
-        "docs": "/docs",
+        "docs": app.docs_url,
         "health": "/api/health"
     } 
\ No newline at end of file
@@ -5,27 +5,57 @@ Authentication middleware for the Hermes Ingestor API.
 from fastapi import Security, HTTPException, Depends
 from fastapi.security import APIKeyHeader
 from ..config import settings
+import hmac
 import logging
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
-api_key_header = APIKeyHeader(name="X-API-Key")
+# Missing keys are rejected in get_api_key, so the check can be switched off
+api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
-async def get_api_key(api_key: str = Security(api_key_header)):
+# Accepted keys, encoded once; API_KEY may hold several comma-separated keys
+_API_KEYS = tuple(
+    key.strip().encode() for key in settings.api_key.split(",") if key.strip()
+)
+
+
+def _is_valid_api_key(api_key: str) -> bool:
+    """
+    Check an API key against the accepted keys in constant time.
+    
+    Every accepted key is compared, so the time taken doesn't reveal
+    which key matched or how much of a key was correct.
+    """
+    candidate = api_key.encode()
+    valid = False
+    for key in _API_KEYS:
+        valid |= hmac.compare_digest(candidate, key)
+    return valid
+
+
+async def get_api_key(api_key: Optional[str] = Security(api_key_header)) -> Optional[str]:
     """
     Validate the API key from the request header.
     
+    Authentication is off when API_KEY is empty; every request is then
+    accepted without a key.
+    
     Args:
-        api_key: The API key from the X-API-Key header
+        api_key: The API key from the X-API-Key header, if sent
         
     Returns:
-        The validated API key
+        The validated API key, or None when authentication is off
         
     Raises:
-        HTTPException: If the API key is invalid
+        HTTPException: If the API key is missing or invalid
     """
-    if api_key != settings.api_key:
-        logger.warning(f"Invalid API key attempt from {api_key[:8]}...")
+    if not _API_KEYS:
+        return None
+    if api_key is None:
+        raise HTTPException(status_code=403, detail="Not authenticated")
+    if not _is_valid_api_key(api_key):
+        logger.warning("Invalid API key attempt from %s...", api_key[:8])
         raise HTTPException(
             status_code=403,
             detail="Invalid API key"
@@ -2,87 +2,386 @@
 Middleware for the Hermes Ingestor API.
 """
 
-from fastapi import Request, Response
-from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 from ..config import settings
+import asyncio
+import hashlib
+import numpy as np
+import orjson
 import time
 import logging
-from typing import Dict, List, Tuple
-from collections import defaultdict
+from typing import Iterable, Optional, Tuple
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on IPs/API keys tracked in memory, so rotating source
+# addresses can't grow the limiter without bound
+_MAX_TRACKED_CLIENTS = 100_000
+
+# Slots allocated for a new client's timestamps; grown as needed
+_INITIAL_WINDOW_SLOTS = 8
+
+
+class RequestWindow:
+    """
+    Request timestamps for one client, oldest first.
+
+    Timestamps live in a contiguous float64 array between ``head`` and
+    ``head + count``. Because they are appended in order, expired entries
+    are found with a binary search and dropped by moving ``head`` forward.
+    """
+    
+    __slots__ = ("times", "head", "count")
+    
+    def __init__(self):
+        self.times = np.empty(_INITIAL_WINDOW_SLOTS, dtype=np.float64)
+        self.head = 0
+        self.count = 0
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def newest(self) -> float:
+        """Return the most recent timestamp. The window must not be empty."""
+        return float(self.times[self.head + self.count - 1])
+    
+    def evict_until(self, cutoff: float):
+        """
+        Drop timestamps at or before the cutoff.
+
+        Args:
+            cutoff: Oldest time still outside the window
+        """
+        if not self.count:
+            return
+        live = self.times[self.head:self.head + self.count]
+        dropped = int(np.searchsorted(live, cutoff, side="right"))
+        self.head += dropped
+        self.count -= dropped
+    
+    def append(self, timestamp: float):
+        """
+        Add a timestamp, compacting or growing the buffer when it reaches the end.
+
+        Args:
+            timestamp: Time of the request, no earlier than the last one
+        """
+        end = self.head + self.count
+        if end == len(self.times):
+            if self.count * 2 > len(self.times):
+                grown = np.empty(len(self.times) * 2, dtype=np.float64)
+                grown[:self.count] = self.times[self.head:end]
+                self.times = grown
+            else:
+                self.times[:self.count] = self.times[self.head:end]
+            self.head = 0
+            end = self.count
+        self.times[end] = timestamp
+        self.count += 1
+
 class RateLimiter:
-    """Rate limiter for API requests."""
+    """
+    Rate limiter for API requests.
+
+    When connected to Redis, counters are kept in fixed windows shared by
+    every worker process. Otherwise each process tracks its own requests
+    in memory, least recently seen clients first, and a background task
+    started with ``start()`` drops clients idle for a full window.
+    """
     
     def __init__(self):
-        self.requests: Dict[str, List[float]] = defaultdict(list)
-        self.api_key_requests: Dict[str, List[float]] = defaultdict(list)
+        self.requests: "OrderedDict[str, RequestWindow]" = OrderedDict()
+        self.api_key_requests: "OrderedDict[str, RequestWindow]" = OrderedDict()
+        self.redis = None
+        # Whether the last Redis check failed, so an outage is logged once
+        self._redis_failing = False
+        self._gc_task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start the stale client cleanup task. Must be called from a running event loop."""
+        if self._gc_task is None:
+            self._gc_task = asyncio.create_task(self._gc_loop())
     
-    async def check_rate_limit(self, request: Request) -> Tuple[bool, str]:
+    async def stop(self):
+        """Stop the stale client cleanup task."""
+        if self._gc_task is None:
+            return
+        self._gc_task.cancel()
+        try:
+            await self._gc_task
+        except asyncio.CancelledError:
+            pass
+        self._gc_task = None
+    
+    async def connect(self, redis_url: Optional[str] = None):
+        """
+        Connect to Redis so rate limit state is shared between workers.
+
+        Args:
+            redis_url: Redis connection URL; in-memory limiting is used if empty
+        """
+        if not redis_url:
+            return
+        
+        import redis.asyncio as aioredis
+        
+        self.redis = aioredis.from_url(redis_url)
+        logger.info("Using Redis for rate limiting")
+    
+    async def close(self):
+        """Close the Redis connection pool, if any."""
+        if self.redis is not None:
+            await self.redis.aclose()
+            self.redis = None
+    
+    async def check_rate_limit(self, client_ip: str, api_key: str = "") -> Tuple[bool, str]:
         """
         Check if the request should be rate limited.
         
         Args:
-            request: The incoming request
+            client_ip: IP address of the client
+            api_key: API key sent with the request, if any
             
         Returns:
             Tuple of (is_limited, reason)
         """
-        client_ip = request.client.host
-        api_key = request.headers.get("X-API-Key", "")
-        current_time = time.time()
+        if self.redis is not None:
+            try:
+                result = await self._check_redis_rate_limit(client_ip, api_key)
+            except Exception as e:
+                if not self._redis_failing:
+                    self._redis_failing = True
+                    logger.warning("Redis rate limit check failed, using in-memory limits until it recovers: %s", e)
+            else:
+                if self._redis_failing:
+                    self._redis_failing = False
+                    logger.info("Redis rate limit checks recovered")
+                return result
+        
+        current_time = time.monotonic()
         
         # Clean old requests
-        self._clean_old_requests(client_ip, current_time)
-        self._clean_old_requests(api_key, current_time)
+        ip_requests = self._get_bucket(self.requests, client_ip)
+        self._clean_old_requests(ip_requests, current_time)
+        
+        key_requests = None
+        if api_key:
+            key_requests = self._get_bucket(self.api_key_requests, api_key)
+            self._clean_old_requests(key_requests, current_time)
         
         # Check IP rate limit
-        if len(self.requests[client_ip]) >= settings.rate_limit_requests:
+        if len(ip_requests) >= settings.rate_limit_requests:
             return True, "Too many requests from this IP"
         
         # Check API key rate limit
-        if api_key and len(self.api_key_requests[api_key]) >= settings.rate_limit_requests:
+        if key_requests is not None and len(key_requests) >= settings.rate_limit_requests:
             return True, "Too many requests with this API key"
         
         # Add current request
-        self.requests[client_ip].append(current_time)
+        ip_requests.append(current_time)
+        if key_requests is not None:
+            key_requests.append(current_time)
+        
+        return False, ""
+    
+    async def _check_redis_rate_limit(self, client_ip: str, api_key: str) -> Tuple[bool, str]:
+        """
+        Check the rate limit using fixed-window counters in Redis.
+
+        Each window gets its own keys, so old counters expire on their own
+        and INCR plus EXPIRE for all keys go out in a single round trip.
+        API keys appear in key names only as a digest, so they can't be read
+        back from Redis.
+        """
+        window = settings.rate_limit_window
+        window_bucket = int(time.time() // window)
+        
+        pipe = self.redis.pipeline(transaction=False)
+        ip_key = f"rl:ip:{client_ip}:{window_bucket}"
+        pipe.incr(ip_key)
+        pipe.expire(ip_key, window, nx=True)
         if api_key:
-            self.api_key_requests[api_key].append(current_time)
+            digest = hashlib.blake2b(api_key.encode(), digest_size=16).hexdigest()
+            api_key_key = f"rl:key:{digest}:{window_bucket}"
+            pipe.incr(api_key_key)
+            pipe.expire(api_key_key, window, nx=True)
+        counts = await pipe.execute()
+        
+        if counts[0] > settings.rate_limit_requests:
+            return True, "Too many requests from this IP"
+        
+        if api_key and counts[2] > settings.rate_limit_requests:
+            return True, "Too many requests with this API key"
         
         return False, ""
     
-    def _clean_old_requests(self, key: str, current_time: float):
-        """Remove requests older than the rate limit window."""
+    def _clean_old_requests(self, timestamps: RequestWindow, current_time: float):
+        """
+        Remove requests older than the rate limit window.
+        """
+        timestamps.evict_until(current_time - settings.rate_limit_window)
+    
+    def _get_bucket(self, buckets: "OrderedDict[str, RequestWindow]", key: str) -> RequestWindow:
+        """
+        Get the request timestamps for a client, evicting the least recently seen client when full.
+
+        Args:
+            buckets: Timestamps by client, least recently seen first
+            key: Client IP or API key
+
+        Returns:
+            The client's request timestamps
+        """
+        timestamps = buckets.get(key)
+        if timestamps is None:
+            timestamps = buckets[key] = RequestWindow()
+            if len(buckets) > _MAX_TRACKED_CLIENTS:
+                buckets.popitem(last=False)
+        else:
+            buckets.move_to_end(key)
+        return timestamps
+    
+    def remove_stale(self, current_time: Optional[float] = None) -> int:
+        """
+        Drop clients with no requests inside the rate limit window.
+
+        Args:
+            current_time: Monotonic time to compare against (defaults to now)
+
+        Returns:
+            Number of clients removed
+        """
+        if current_time is None:
+            current_time = time.monotonic()
         window = settings.rate_limit_window
-        if key in self.requests:
-            self.requests[key] = [t for t in self.requests[key] 
-                                if current_time - t < window]
-        if key in self.api_key_requests:
-            self.api_key_requests[key] = [t for t in self.api_key_requests[key] 
-                                        if current_time - t < window]
+        removed = 0
+        
+        for buckets in (self.requests, self.api_key_requests):
+            for key in list(buckets):
+                timestamps = buckets[key]
+                if not timestamps or current_time - timestamps.newest() >= window:
+                    del buckets[key]
+                    removed += 1
+        
+        return removed
+    
+    async def _gc_loop(self):
+        """Remove stale clients once per rate limit window."""
+        while True:
+            await asyncio.sleep(settings.rate_limit_window)
+            removed = self.remove_stale()
+            if removed:
+                logger.debug(f"Removed {removed} idle rate limit entries")
 
 # Create rate limiter instance
 rate_limiter = RateLimiter()
 
-async def rate_limit_middleware(request: Request, call_next):
+
+class RateLimitMiddleware:
     """
-    Rate limiting middleware.
-    
+    Rate limiting middleware implemented as a plain ASGI app.
+
+    Works directly on the ASGI scope instead of going through
+    BaseHTTPMiddleware, so no Request/Response objects are built
+    for requests that are let through.
+
+    Clients are told apart by the connection's address, so behind a proxy
+    every client shares one limit unless uvicorn takes the address from
+    X-Forwarded-For (FORWARDED_ALLOW_IPS set to the proxy's address).
+    Requests to ``exempt_paths`` (health probes) are never limited.
+    """
+
+    def __init__(self, app: ASGIApp, exempt_paths: Iterable[str] = ()):
+        self.app = app
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Rate limit HTTP requests before passing them to the wrapped app.
+
+        Args:
+            scope: The ASGI connection scope
+            receive: The ASGI receive channel
+            send: The ASGI send channel
+        """
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        client_ip = client[0] if client else ""
+
+        api_key = ""
+        for name, value in scope["headers"]:
+            if name == b"x-api-key":
+                api_key = value.decode("latin-1")
+                break
+
+        is_limited, reason = await rate_limiter.check_rate_limit(client_ip, api_key)
+
+        if is_limited:
+            logger.warning(f"Rate limit exceeded: {reason}")
+            await _send_error(send, 429, reason)
+            return
+
+        await self.app(scope, receive, send)
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject oversized uploads based on their Content-Length header.
+
+    FastAPI parses multipart bodies before the endpoint runs, so this check
+    has to happen in middleware to refuse a large upload before any of it is
+    read. Requests without a Content-Length (chunked encoding) are passed
+    through and caught by the endpoint's own file size check.
+    """
+
+    def __init__(self, app: ASGIApp, paths: Iterable[str], max_bytes: int):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Check the declared body size of uploads to the configured paths.
+
+        Args:
+            scope: The ASGI connection scope
+            receive: The ASGI receive channel
+            send: The ASGI send channel
+        """
+        if scope["type"] == "http" and scope["path"] in self.paths:
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit() and int(value) > self.max_bytes:
+                        await _send_error(
+                            send, 413,
+                            f"File too large. Maximum size: {settings.max_file_size_mb}MB"
+                        )
+                        return
+                    break
+
+        await self.app(scope, receive, send)
+
+
+async def _send_error(send: Send, status: int, detail: str):
+    """
+    Send a JSON error response directly over the ASGI send channel.
+
     Args:
-        request: The incoming request
-        call_next: The next middleware/route handler
-        
-    Returns:
-        The response from the next handler
+        send: The ASGI send channel
+        status: HTTP status code
+        detail: Error message
     """
-    is_limited, reason = await rate_limiter.check_rate_limit(request)
-    
-    if is_limited:
-        logger.warning(f"Rate limit exceeded: {reason}")
-        return JSONResponse(
-            status_code=429,
-            content={"detail": reason}
-        )
-    
-    return await call_next(request) 
\ No newline at end of file
+    body = orjson.dumps({"detail": detail})
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
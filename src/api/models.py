@@ -3,7 +3,11 @@ Pydantic models for the API.
 """
 
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Response models only ever carry fields we set ourselves, so reject anything
+# else and skip re-validation on attribute assignment
+RESPONSE_MODEL_CONFIG = ConfigDict(extra="forbid", validate_assignment=False)
 
 
 class DocumentMetadata(BaseModel):
@@ -21,26 +25,44 @@ class DocumentMetadata(BaseModel):
 class ProcessingResponse(BaseModel):
     """Response model for document processing."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     success: bool = Field(..., description="Whether the processing was successful")
     file_name: Optional[str] = Field(None, description="Name of the processed file")
     chunks_created: Optional[int] = Field(None, description="Number of chunks created")
     processing_time: Optional[float] = Field(None, description="Processing time in seconds")
     error: Optional[str] = Field(None, description="Error message if processing failed")
     message: Optional[str] = Field(None, description="Additional message from the processing")
+    task_id: Optional[str] = Field(None, description="ID of the background task, if processing was deferred")
 
 
 class BatchProcessingResponse(BaseModel):
     """Response model for batch document processing."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     total_files: int = Field(..., description="Total number of files processed")
     successful: int = Field(..., description="Number of files successfully processed")
     failed: int = Field(..., description="Number of files that failed processing")
     results: List[ProcessingResponse] = Field(..., description="Individual processing results")
 
 
+class TaskStatusResponse(BaseModel):
+    """Response model for background task status."""
+    
+    model_config = RESPONSE_MODEL_CONFIG
+    
+    task_id: str = Field(..., description="ID of the background task")
+    status: str = Field(..., description="Task status: pending, processing, completed or failed")
+    file_name: Optional[str] = Field(None, description="Name of the file being processed")
+    result: Optional[ProcessingResponse] = Field(None, description="Processing result once the task has finished")
+
+
 class DeleteResponse(BaseModel):
     """Response model for document deletion."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     success: bool = Field(..., description="Whether the deletion was successful")
     deleted_count: Optional[int] = Field(None, description="Number of chunks deleted")
     error: Optional[str] = Field(None, description="Error message if deletion failed")
@@ -49,15 +71,20 @@ class DeleteResponse(BaseModel):
 class HealthResponse(BaseModel):
     """Response model for health check."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     status: str = Field(..., description="Service status")
     version: str = Field(..., description="Service version")
     qdrant_status: str = Field(..., description="Qdrant connection status")
+    qdrant_latency_ms: Optional[float] = Field(None, description="Latency of the last Qdrant check in milliseconds")
     error: Optional[str] = Field(None, description="Error message if health check failed")
 
 
 class StorageUsage(BaseModel):
     """Model for storage usage information."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     documents: int = Field(..., description="Total number of documents in the database")
     chunks: int = Field(..., description="Total number of chunks in the database")
     # Add more fields like vector_count if needed
@@ -66,6 +93,8 @@ class StorageUsage(BaseModel):
 class StatusResponse(BaseModel):
     """Response model for service status."""
     
+    model_config = RESPONSE_MODEL_CONFIG
+    
     status: str = Field(..., description="Service status")
     document_count: int = Field(..., description="Total number of documents in the database")
     chunk_count: int = Field(..., description="Total number of chunks in the database")
@@ -76,14 +105,8 @@ class StatusResponse(BaseModel):
 class UrlIngestPayload(BaseModel):
     """Model for URL ingestion payload."""
     
+    model_config = ConfigDict(str_strip_whitespace=True)
+    
     url: str = Field(..., description="URL of the document to be ingested")
     metadata: Optional[Dict[str, Any]] = Field(None, description="Metadata for the document")
-
-
-class StatusResponse(BaseModel):
-    """Response model for service status."""
-    
-    status: str = Field(..., description="Service status")
-    document_count: int = Field(..., description="Total number of documents in the database")
-    chunk_count: int = Field(..., description="Total number of chunks in the database")
-    storage_usage: Dict[str, Any] = Field(..., description="Storage usage information") 
\ No newline at end of file
+ 
\ No newline at end of file
@@ -2,38 +2,66 @@
 API routes for Hermes Ingestor service.
 """
 
+import asyncio
+import multiprocessing
 import os
-from typing import List, Dict, Any, Optional
+import shutil
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 import logging
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, BackgroundTasks, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
-import json
-import requests
-import tempfile
+import orjson
+from pydantic import ValidationError
+import httpx
 
-from ..ingestor import Ingestor
+from ..ingestor import UPLOAD_CHUNK_SIZE, Ingestor, init_worker, process_saved_upload_in_worker
+from ..pipeline import IngestPipeline
 from ..storage import QdrantStorage
 from ..config import settings
+from ..utils.audit import audit_logger
 from . import models
+from .auth import get_api_key
 from .. import __version__
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Create API router
-router = APIRouter()
+# Create API routers; every endpoint but the health check needs an API key
+# when API_KEY is set, so health probes work without one
+router = APIRouter(dependencies=[Depends(get_api_key)])
+health_router = APIRouter()
 
 # Initialize services
 ingestor = Ingestor()
 storage = QdrantStorage()
 
+# Worker processes for ingestion, created by start_ingest_pool
+_ingest_pool: Optional[ProcessPoolExecutor] = None
 
-def _parse_metadata(metadata_str: str = Form(None)) -> Optional[Dict[str, Any]]:
+# Cached /status responses keyed by collection name: (expires_at, response),
+# dropped whenever documents are ingested or deleted
+_status_cache: Dict[str, Tuple[float, models.StatusResponse]] = {}
+
+# Last Qdrant health check: (expires_at, status, latency_ms)
+_health_cache: Optional[Tuple[float, str, Optional[float]]] = None
+_health_lock = asyncio.Lock()
+
+# Background ingestion tasks by ID, oldest first
+_tasks: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_MAX_TRACKED_TASKS = 1000
+
+
+def _parse_metadata(metadata_str: str = Form(None, alias="metadata")) -> Optional[Dict[str, Any]]:
     """
     Parse metadata JSON string.
     
     Args:
-        metadata_str: JSON string of metadata or None
+        metadata_str: JSON string of metadata (the "metadata" form field) or None
         
     Returns:
         Parsed metadata dict or None
@@ -42,74 +70,425 @@ def _parse_metadata(metadata_str: str = Form(None)) -> Optional[Dict[str, Any]]:
         return None
     
     try:
-        return json.loads(metadata_str)
-    except json.JSONDecodeError:
+        return orjson.loads(metadata_str)
+    except orjson.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid metadata JSON format")
 
 
+async def _parse_filters(request: Request) -> Dict[str, Any]:
+    """
+    Parse a JSON object of metadata filters from the request body.
+    
+    The raw body is decoded with orjson instead of going through FastAPI's
+    stdlib json body parsing.
+    
+    Args:
+        request: The incoming request
+        
+    Returns:
+        Metadata filters
+    """
+    try:
+        filters = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    
+    if not isinstance(filters, dict):
+        raise HTTPException(status_code=400, detail="Filters must be a JSON object")
+    
+    return filters
+
+
+async def _parse_url_payload(request: Request) -> models.UrlIngestPayload:
+    """
+    Parse and validate a URL ingestion payload from the request body.
+    
+    The body is validated straight from JSON by pydantic's parser, without
+    first building Python objects with the stdlib json module.
+    
+    Args:
+        request: The incoming request
+        
+    Returns:
+        The validated payload
+    """
+    try:
+        return models.UrlIngestPayload.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False))
+
+
+def _invalidate_status_cache() -> None:
+    """Drop cached /status responses so counts reflect the latest writes."""
+    _status_cache.clear()
+
+
+def _create_task(file_name: str) -> str:
+    """
+    Register a new background task.
+    
+    Args:
+        file_name: Name of the file the task will process
+        
+    Returns:
+        ID of the new task
+    """
+    task_id = uuid.uuid4().hex
+    _tasks[task_id] = {"task_id": task_id, "status": "pending", "file_name": file_name, "result": None}
+    
+    # Forget the oldest tasks so the registry stays bounded
+    while len(_tasks) > _MAX_TRACKED_TASKS:
+        _tasks.popitem(last=False)
+    
+    return task_id
+
+
+def _finish_task(task_id: str, result: Dict[str, Any]) -> None:
+    """
+    Record the result of a background task.
+    
+    Args:
+        task_id: ID of the task
+        result: Result dict returned by the ingestor
+    """
+    _invalidate_status_cache()
+    
+    task = _tasks.get(task_id)
+    if task is None:
+        return
+    
+    task["result"] = _processing_response(result)
+    task["status"] = "completed" if result["success"] else "failed"
+
+
+def _processing_response(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a processing response from an ingestor result dict.
+    
+    The ingest and task status endpoints return this dict as is, shaped
+    like models.ProcessingResponse, so no model is built or validated per
+    file on the way out.
+    
+    Args:
+        result: Result dict returned by the ingestor
+        
+    Returns:
+        Processing response fields
+    """
+    return {
+        "success": result["success"],
+        "file_name": result["file_name"],
+        "chunks_created": result.get("chunks_created"),
+        "processing_time": result.get("processing_time"),
+        "error": result.get("error"),
+        "message": result.get("message"),
+        "task_id": result.get("task_id")
+    }
+
+
+def start_ingest_pool() -> None:
+    """Start the ingestion worker processes if INGEST_PROCESSES is set."""
+    global _ingest_pool
+    
+    if settings.ingest_processes <= 0 or _ingest_pool is not None:
+        return
+    
+    # Spawn rather than fork so children don't inherit the server's threads
+    _ingest_pool = ProcessPoolExecutor(
+        max_workers=settings.ingest_processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker
+    )
+    logger.info(f"Started {settings.ingest_processes} ingestion worker processes")
+
+
+def stop_ingest_pool() -> None:
+    """Shut down the ingestion worker processes, if running."""
+    global _ingest_pool
+    
+    if _ingest_pool is not None:
+        _ingest_pool.shutdown(cancel_futures=True)
+        _ingest_pool = None
+
+
+async def warm_up() -> None:
+    """
+    Pay the model and connection start-up costs before the first request.
+    
+    Runs a warm-up batch through the in-process embedding model, unless
+    ingestion runs in worker processes (which warm up their own), and opens
+    the Qdrant connection. Failures are logged rather than raised so the
+    service still starts when Qdrant is briefly unavailable.
+    """
+    if _ingest_pool is None:
+        try:
+            await asyncio.to_thread(ingestor.embedder.warm_up)
+        except Exception as e:
+            logger.warning(f"Embedding model warm-up failed: {str(e)}")
+    
+    try:
+        await asyncio.to_thread(storage.client.get_collections)
+    except Exception as e:
+        logger.warning(f"Could not connect to Qdrant at startup: {str(e)}")
+
+
+async def _process_saved_upload(tmp_path: str, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Process a saved upload off the event loop.
+    
+    Uses the ingestion worker processes when they are running, so
+    embedding isn't serialized by the GIL. Otherwise the chunks go through
+    the ingestor's shared queues, which embed and store them in batches
+    together with those of concurrent uploads.
+    
+    Args:
+        tmp_path: Path returned by Ingestor.save_upload
+        metadata: Optional metadata to include with the document
+        
+    Returns:
+        Result dict from the ingestor
+    """
+    if _ingest_pool is not None:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _ingest_pool, process_saved_upload_in_worker, tmp_path, metadata
+        )
+    
+    return await ingestor.process_saved_upload_batched(tmp_path, metadata)
+
+
+async def _run_ingest_task(task_id: str, tmp_path: str, metadata: Optional[Dict[str, Any]]) -> None:
+    """
+    Process a saved upload as a background task.
+    
+    Args:
+        task_id: ID of the task
+        tmp_path: Path returned by Ingestor.save_upload
+        metadata: Optional metadata to include with the document
+    """
+    task = _tasks.get(task_id)
+    if task is not None:
+        task["status"] = "processing"
+    
+    try:
+        result = await _process_saved_upload(tmp_path, metadata)
+    except Exception as e:
+        logger.error(f"Error processing file in background task {task_id}: {str(e)}", exc_info=True)
+        result = {
+            "success": False,
+            "file_name": os.path.basename(tmp_path),
+            "error": f"Error processing file: {str(e)}"
+        }
+    
+    _finish_task(task_id, result)
+
+
 @router.post(
     "/ingest/file",
-    response_model=models.ProcessingResponse,
+    response_model=None,
+    responses={200: {"model": models.ProcessingResponse}, 202: {"model": models.ProcessingResponse}},
     summary="Ingest a single document",
     description="Upload and process a single document file"
 )
 async def ingest_file(
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    metadata: Optional[Dict[str, Any]] = Depends(_parse_metadata)
+    metadata: Optional[Dict[str, Any]] = Depends(_parse_metadata),
+    background: bool = Query(False, description="Process the file in the background and return a task ID")
 ):
     """
     Ingest a single document file.
     
     Args:
+        request: The incoming request
+        response: The outgoing response, used to set 202 for background processing
+        background_tasks: FastAPI background tasks
         file: The document file to process
         metadata: Optional metadata to include with the document
+        background: Whether to return immediately and process the file in the background
         
     Returns:
-        Processing result
+        Processing result, or the background task ID
     """
+    _audit(request, "file_upload", {"filename": file.filename})
+    
     # Check file extension
-    _, ext = os.path.splitext(file.filename)
-    ext = ext[1:].lower() if ext else ""
+    ext = _file_extension(file.filename)
     
     if ext not in settings.supported_formats:
         raise HTTPException(
             status_code=400,
-            detail=f"Unsupported file format: {ext}. Supported formats: {', '.join(settings.supported_formats)}"
+            detail=f"Unsupported file format: {ext}. Supported formats: {', '.join(sorted(settings.supported_formats))}"
         )
     
-    # Check file size
-    if file.size > settings.max_file_size_mb * 1024 * 1024:
+    # Check file size (Content-Length is already checked by UploadSizeLimitMiddleware)
+    if file.size is not None and file.size > settings.max_file_size_mb * 1024 * 1024:
         raise HTTPException(
-            status_code=400,
+            status_code=413,
             detail=f"File too large. Maximum size: {settings.max_file_size_mb}MB"
         )
     
     try:
-        # Read the file content first
-        file_content = await file.read()
-        
-        # Process the file without awaiting the process_upload function
-        result = ingestor.process_upload(file_content, file.filename, metadata)
+        if background:
+            # The upload is closed once the response is sent, so save it to disk first
+            tmp_path = await asyncio.to_thread(ingestor.save_upload, file.file, file.filename)
+            task_id = _create_task(file.filename)
+            background_tasks.add_task(_run_ingest_task, task_id, tmp_path, metadata)
+            
+            response.status_code = 202
+            return _processing_response({
+                "success": True,  # Indicates the request was accepted
+                "file_name": file.filename,
+                "message": f"Processing started for file: {file.filename}",
+                "task_id": task_id
+            })
         
-        # Create response
-        response = models.ProcessingResponse(
-            success=result["success"],
-            file_name=result["file_name"],
-            chunks_created=result.get("chunks_created"),
-            processing_time=result.get("processing_time"),
-            error=result.get("error")
-        )
+        # Stream the spooled upload to disk and process it off the event loop
+        tmp_path = await asyncio.to_thread(ingestor.save_upload, file.file, file.filename)
+        result = await _process_saved_upload(tmp_path, metadata)
+        _invalidate_status_cache()
         
-        return response
+        return _processing_response(result)
     
     except Exception as e:
         logger.error(f"Error processing file: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
 
+@router.get(
+    "/status/{task_id}",
+    response_model=None,
+    responses={200: {"model": models.TaskStatusResponse}},
+    summary="Background task status",
+    description="Get the status and result of a background ingestion task"
+)
+async def task_status(task_id: str, request: Request):
+    """
+    Get the status of a background ingestion task.
+    
+    Args:
+        task_id: ID returned when the task was started
+        request: The incoming request
+        
+    Returns:
+        Task status and result, if finished
+    """
+    _audit(request, "status_check", {"task_id": task_id})
+    
+    task = _tasks.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Task not found: {task_id}")
+    
+    return task
+
+
+def _audit(request: Request, event_type: str, details: Dict[str, Any]):
+    """
+    Record an audit event for a request.
+    
+    Only the start of the API key is recorded, as in failed key attempts,
+    and only when API_KEY is set, so the key has been checked.
+    
+    Args:
+        request: The incoming request
+        event_type: Type of event (e.g., 'file_upload')
+        details: Additional event details
+    """
+    api_key = request.headers.get("X-API-Key")
+    audit_logger.log_event(
+        event_type=event_type,
+        user_id=api_key[:8] if api_key and settings.api_key else None,
+        ip_address=request.client.host if request.client else None,
+        details=details
+    )
+
+
+def _file_extension(filename: str) -> str:
+    """
+    Return the lowercased extension of a file name without the dot.
+    
+    Args:
+        filename: Name of the file
+        
+    Returns:
+        The extension, or an empty string if there is none
+    """
+    _, dot, ext = filename.rpartition(".")
+    return ext.lower() if dot and "/" not in ext else ""
+
+
+def _check_batch_file(file: UploadFile, max_bytes: int) -> Optional[Dict[str, Any]]:
+    """
+    Check that a file from a batch upload can be processed.
+    
+    Args:
+        file: The uploaded file
+        max_bytes: Maximum accepted file size in bytes
+        
+    Returns:
+        An error response for the file, or None if it is acceptable
+    """
+    # Check file extension
+    ext = _file_extension(file.filename)
+    
+    if ext not in settings.supported_formats:
+        # Skip unsupported files
+        return _processing_response({
+            "success": False,
+            "file_name": file.filename,
+            "error": f"Unsupported file format: {ext}"
+        })
+    
+    # Check file size
+    if file.size is not None and file.size > max_bytes:
+        return _processing_response({
+            "success": False,
+            "file_name": file.filename,
+            "error": f"File too large. Maximum size: {settings.max_file_size_mb}MB"
+        })
+    
+    return None
+
+
+async def _ingest_one(
+    file: UploadFile,
+    metadata: Optional[Dict[str, Any]],
+    semaphore: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """
+    Process one file from a batch upload.
+    
+    Args:
+        file: The document file to process
+        metadata: Optional metadata to include with the document
+        semaphore: Semaphore limiting how many files are processed at once
+        
+    Returns:
+        Processing result for the file
+    """
+    try:
+        async with semaphore:
+            # Run the blocking pipeline off the event loop
+            tmp_path = await asyncio.to_thread(ingestor.save_upload, file.file, file.filename)
+            result = await _process_saved_upload(tmp_path, metadata)
+        
+        return _processing_response(result)
+    
+    except Exception as e:
+        logger.error(f"Error processing file {file.filename}: {str(e)}", exc_info=True)
+        return _processing_response({
+            "success": False,
+            "file_name": file.filename,
+            "error": f"Error processing file: {str(e)}"
+        })
+
+
 @router.post(
     "/ingest/files",
-    response_model=models.BatchProcessingResponse,
+    response_model=None,
+    responses={200: {"model": models.BatchProcessingResponse}},
     summary="Ingest multiple documents",
     description="Upload and process multiple document files"
 )
@@ -132,74 +511,38 @@ async def ingest_files(
     if not files:
         raise HTTPException(status_code=400, detail="No files provided")
     
-    results = []
-    successful = 0
-    failed = 0
+    max_bytes = settings.max_file_size_mb * 1024 * 1024
+    results: List[Optional[Dict[str, Any]]] = [_check_batch_file(file, max_bytes) for file in files]
+    accepted = [i for i, result in enumerate(results) if result is None]
     
-    for file in files:
-        # Check file extension
-        _, ext = os.path.splitext(file.filename)
-        ext = ext[1:].lower() if ext else ""
-        
-        if ext not in settings.supported_formats:
-            # Skip unsupported files
-            results.append(models.ProcessingResponse(
-                success=False,
-                file_name=file.filename,
-                error=f"Unsupported file format: {ext}"
-            ))
-            failed += 1
-            continue
-        
-        # Check file size
-        if file.size > settings.max_file_size_mb * 1024 * 1024:
-            results.append(models.ProcessingResponse(
-                success=False,
-                file_name=file.filename,
-                error=f"File too large. Maximum size: {settings.max_file_size_mb}MB"
-            ))
-            failed += 1
-            continue
-        
-        try:
-            # Read the file content first
-            file_content = await file.read()
-            
-            # Process the file without awaiting the process_upload function
-            result = ingestor.process_upload(file_content, file.filename, metadata)
-            
-            # Create response
-            response = models.ProcessingResponse(
-                success=result["success"],
-                file_name=result["file_name"],
-                chunks_created=result.get("chunks_created"),
-                processing_time=result.get("processing_time"),
-                error=result.get("error")
-            )
-            
-            results.append(response)
-            
-            if result["success"]:
-                successful += 1
-            else:
-                failed += 1
-        
-        except Exception as e:
-            logger.error(f"Error processing file {file.filename}: {str(e)}", exc_info=True)
-            results.append(models.ProcessingResponse(
-                success=False,
-                file_name=file.filename,
-                error=f"Error processing file: {str(e)}"
-            ))
-            failed += 1
-    
-    # Create batch response
-    return models.BatchProcessingResponse(
-        total_files=len(files),
-        successful=successful,
-        failed=failed,
-        results=results
-    )
+    if _ingest_pool is not None:
+        # Each file goes through the whole pipeline in a worker process,
+        # with at most max_parallel_ingest in flight
+        semaphore = asyncio.Semaphore(settings.max_parallel_ingest)
+        processed = await asyncio.gather(
+            *(_ingest_one(files[i], metadata, semaphore) for i in accepted)
+        )
+    else:
+        # Overlap loading, chunking, embedding and storage across files
+        pipeline_results = await IngestPipeline(ingestor).run(
+            [(files[i].file, files[i].filename) for i in accepted], metadata
+        )
+        processed = [_processing_response(result) for result in pipeline_results]
+    
+    for i, result in zip(accepted, processed):
+        results[i] = result
+    _invalidate_status_cache()
+    
+    successful = sum(1 for result in results if result["success"])
+    failed = len(results) - successful
+    
+    # Create batch response, shaped like models.BatchProcessingResponse
+    return {
+        "total_files": len(files),
+        "successful": successful,
+        "failed": failed,
+        "results": results
+    }
 
 
 @router.delete(
@@ -219,8 +562,10 @@ async def delete_document(filename: str):
         Deletion result
     """
     try:
-        # Delete the document
-        result = ingestor.delete_document(filename)
+        # Delete the document; the count and delete calls block, so keep
+        # them off the event loop
+        result = await asyncio.to_thread(ingestor.delete_document, filename)
+        _invalidate_status_cache()
         
         # Create response
         return models.DeleteResponse(
@@ -238,9 +583,12 @@ async def delete_document(filename: str):
     "/document/delete",
     response_model=models.DeleteResponse,
     summary="Delete documents by filter",
-    description="Delete documents and their chunks by metadata filter"
+    description="Delete documents and their chunks by metadata filter",
+    openapi_extra={"requestBody": {"required": True, "content": {"application/json": {
+        "schema": {"type": "object", "additionalProperties": True}
+    }}}}
 )
-async def delete_documents_by_filter(filters: Dict[str, Any]):
+async def delete_documents_by_filter(filters: Dict[str, Any] = Depends(_parse_filters)):
     """
     Delete documents and their chunks by metadata filter.
     
@@ -251,8 +599,9 @@ async def delete_documents_by_filter(filters: Dict[str, Any]):
         Deletion result
     """
     try:
-        # Delete the documents
-        result = ingestor.delete_document(filters)
+        # Delete the documents, off the event loop
+        result = await asyncio.to_thread(ingestor.delete_document, filters)
+        _invalidate_status_cache()
         
         # Create response
         return models.DeleteResponse(
@@ -266,7 +615,7 @@ async def delete_documents_by_filter(filters: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=f"Error deleting documents: {str(e)}")
 
 
-@router.get(
+@health_router.get(
     "/health",
     response_model=models.HealthResponse,
     summary="Health check",
@@ -279,21 +628,49 @@ async def health_check():
     Returns:
         Health status
     """
-    # Check Qdrant connection
-    qdrant_status = "healthy"
-    try:
-        storage.client.get_collections()
-    except Exception as e:
-        logger.error(f"Qdrant health check failed: {str(e)}")
-        qdrant_status = f"unhealthy: {str(e)}"
+    qdrant_status, qdrant_latency_ms = await _check_qdrant()
     
     return models.HealthResponse(
         status="healthy",
         version=__version__,
-        qdrant_status=qdrant_status
+        qdrant_status=qdrant_status,
+        qdrant_latency_ms=qdrant_latency_ms
     )
 
 
+async def _check_qdrant() -> Tuple[str, Optional[float]]:
+    """
+    Check the Qdrant connection, reusing a recent result.
+    
+    Returns:
+        Tuple of (status, latency in milliseconds)
+    """
+    global _health_cache
+    
+    async with _health_lock:
+        if _health_cache and _health_cache[0] > time.monotonic():
+            return _health_cache[1], _health_cache[2]
+        
+        started = time.perf_counter()
+        latency_ms: Optional[float] = None
+        try:
+            await asyncio.wait_for(
+                asyncio.to_thread(storage.client.get_collections),
+                timeout=settings.health_check_timeout
+            )
+            latency_ms = round((time.perf_counter() - started) * 1000, 2)
+            qdrant_status = "healthy"
+        except asyncio.TimeoutError:
+            logger.error("Qdrant health check timed out")
+            qdrant_status = f"unhealthy: timed out after {settings.health_check_timeout}s"
+        except Exception as e:
+            logger.error(f"Qdrant health check failed: {str(e)}")
+            qdrant_status = f"unhealthy: {str(e)}"
+        
+        _health_cache = (time.monotonic() + settings.health_cache_ttl, qdrant_status, latency_ms)
+        return qdrant_status, latency_ms
+
+
 @router.get(
     "/status",
     response_model=models.StatusResponse,
@@ -307,142 +684,239 @@ async def service_status():
     Returns:
         Service status
     """
+    collection_name = settings.qdrant.collection_name
+    
+    # Serve frequent polling from memory
+    cached = _status_cache.get(collection_name)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    
     try:
-        # Get unique document count by using a specialized filter query
-        # instead of the unsupported group_by parameter
+        # Get chunk count; the Qdrant calls block, so they run off the event loop
+        chunk_count = await asyncio.to_thread(storage.count_by_filters)
+        
+        # Get unique document count
         try:
-            # Get all documents with payload that contains filename metadata
-            results = storage.client.scroll(
-                collection_name=settings.qdrant.collection_name,
-                scroll_filter=None,
-                limit=1000,  # Set a reasonable limit
-                with_payload=True,
-                with_vectors=False
-            )
-            
-            # Extract unique filenames manually
-            unique_filenames = set()
-            for point in results[0]:
-                if point.payload and "metadata" in point.payload and "filename" in point.payload["metadata"]:
-                    unique_filenames.add(point.payload["metadata"]["filename"])
-            
-            document_count = len(unique_filenames)
+            document_count = await asyncio.to_thread(_count_documents, collection_name, chunk_count)
         except Exception as e:
             logger.warning(f"Error getting unique document count: {str(e)}")
             document_count = 0
         
-        # Get chunk count
-        chunk_count = storage.count_by_filters()
-        
         # Get storage usage
         storage_usage = {
             "documents": document_count,
             "chunks": chunk_count,
         }
         
-        return models.StatusResponse(
+        response = models.StatusResponse(
             status="running",
             document_count=document_count,
             chunk_count=chunk_count,
             storage_usage=storage_usage
         )
+        
+        _status_cache[collection_name] = (time.monotonic() + settings.status_cache_ttl, response)
+        
+        return response
     
     except Exception as e:
         logger.error(f"Error getting service status: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error getting service status: {str(e)}")
 
 
+def _count_documents(collection_name: str, chunk_count: int) -> int:
+    """
+    Count unique documents (filenames) in the collection.
+
+    Uses Qdrant's facet API on the indexed metadata.filename field so the
+    distinct values are computed server-side. Falls back to scrolling
+    through points on Qdrant versions without facet support.
+
+    The facet response lists every distinct filename, so its size grows
+    with the number of documents; responses are cached for
+    STATUS_CACHE_TTL seconds to keep that off frequent polling.
+
+    Args:
+        collection_name: Name of the collection to inspect
+        chunk_count: Total number of chunks, an upper bound on the document count
+
+    Returns:
+        Number of unique documents
+    """
+    if not chunk_count:
+        return 0
+    
+    try:
+        facets = storage.client.facet(
+            collection_name=collection_name,
+            key="metadata.filename",
+            limit=chunk_count
+        )
+        return len(facets.hits)
+    except Exception as e:
+        logger.warning(f"Facet count unavailable, falling back to scroll: {str(e)}")
+    
+    # Get all documents with payload that contains filename metadata
+    results = storage.client.scroll(
+        collection_name=collection_name,
+        scroll_filter=None,
+        limit=1000,  # Set a reasonable limit
+        with_payload=True,
+        with_vectors=False
+    )
+    
+    # Extract unique filenames manually
+    unique_filenames = set()
+    for point in results[0]:
+        if point.payload and "metadata" in point.payload and "filename" in point.payload["metadata"]:
+            unique_filenames.add(point.payload["metadata"]["filename"])
+    
+    return len(unique_filenames)
+
+
+async def _ingest_url(url: str, metadata: Optional[Dict[str, Any]], file_name: str) -> Dict[str, Any]:
+    """
+    Download a document and process it.
+    
+    The body is streamed straight to the file the processors read, then the
+    document goes through the same processing path as uploads, sharing the
+    embedding and upsert batches of any other ingestion in flight.
+    
+    Args:
+        url: URL of the document
+        metadata: Optional metadata to include with the document
+        file_name: Name to report if the download fails
+        
+    Returns:
+        Result dict from the ingestor
+    """
+    try:
+        # Download the file without tying up a thread for the transfer
+        async with httpx.AsyncClient(timeout=60, follow_redirects=True) as client: # 60s timeout
+            async with client.stream("GET", url) as response:
+                response.raise_for_status() # Raise exception for bad status codes
+                
+                # Ensure filename has an extension if possible
+                filename = file_name
+                content_type = response.headers.get('content-type')
+                ext = ""
+                if content_type:
+                    if 'pdf' in content_type:
+                        ext = ".pdf"
+                    elif 'text/plain' in content_type:
+                        ext = ".txt"
+                    # Add more content-type checks as needed
+                
+                if not os.path.splitext(filename)[1] and ext:
+                    filename += ext
+                
+                # Stream the decoded body straight into the file the
+                # ingestor will read, with the file I/O off the event loop
+                tmp_path = await asyncio.to_thread(ingestor.upload_path, filename)
+                try:
+                    tmp = await asyncio.to_thread(open, tmp_path, "wb")
+                    try:
+                        async for data in response.aiter_bytes(UPLOAD_CHUNK_SIZE):
+                            await asyncio.to_thread(tmp.write, data)
+                    finally:
+                        await asyncio.to_thread(tmp.close)
+                except BaseException:
+                    shutil.rmtree(os.path.dirname(tmp_path), ignore_errors=True)
+                    raise
+        
+        logger.info(f"Successfully downloaded file from {url} to {tmp_path}")
+        
+        # Combine original metadata with source URL
+        final_metadata = {"source_url": url}
+        if metadata:
+            final_metadata.update(metadata)
+        
+        # Process the downloaded file; this also removes it
+        result = await _process_saved_upload(tmp_path, final_metadata)
+        logger.info(f"Processing result for {url}: {result}")
+        return result
+    
+    except httpx.HTTPError as e:
+        logger.error(f"Error downloading from URL {url}: {e}")
+        return {"success": False, "file_name": file_name, "error": f"Error downloading file: {e}"}
+    except Exception as e:
+        logger.error(f"Error processing downloaded file from URL {url}: {e}", exc_info=True)
+        return {"success": False, "file_name": file_name, "error": f"Error processing file: {e}"}
+
+
+async def _run_url_task(task_id: str, url: str, metadata: Optional[Dict[str, Any]], file_name: str) -> None:
+    """
+    Download and process a document as a background task.
+    
+    Args:
+        task_id: ID of the task
+        url: URL of the document
+        metadata: Optional metadata to include with the document
+        file_name: Name to report if the download fails
+    """
+    task = _tasks.get(task_id)
+    if task is not None:
+        task["status"] = "processing"
+    
+    _finish_task(task_id, await _ingest_url(url, metadata, file_name))
+
+
 @router.post(
     "/ingest/url",
-    response_model=models.ProcessingResponse,
+    response_model=None,
+    responses={200: {"model": models.ProcessingResponse}, 202: {"model": models.ProcessingResponse}},
     summary="Ingest a document from a URL",
     description="Download and process a document from a given URL",
-    status_code=202 # Accepted for background processing
+    status_code=202, # Accepted for background processing
+    openapi_extra={"requestBody": {"required": True, "content": {"application/json": {
+        "schema": models.UrlIngestPayload.model_json_schema()
+    }}}}
 )
 async def ingest_from_url(
-    payload: models.UrlIngestPayload,
-    background_tasks: BackgroundTasks
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    payload: models.UrlIngestPayload = Depends(_parse_url_payload),
+    background: bool = Query(True, description="Process the document in the background and return a task ID")
 ):
     """
-    Ingest a document from a URL in the background.
+    Ingest a document from a URL.
 
     Args:
-        payload: The URL and optional metadata.
+        request: The incoming request
+        response: The outgoing response, used to set 200 for inline processing
         background_tasks: FastAPI background tasks scheduler.
+        payload: The URL and optional metadata.
+        background: Whether to return immediately and process the document in the background
 
     Returns:
-        Acknowledgement that processing has started.
+        Acknowledgement that processing has started, or the processing result
     """
     logger.info(f"Received request to ingest from URL: {payload.url}")
+    _audit(request, "url_ingest", {"url": payload.url})
 
     # Basic URL validation (could be more robust)
     if not payload.url.startswith(("http://", "https://")):
         raise HTTPException(status_code=400, detail="Invalid URL provided")
 
-    def process_url_task():
-        """The actual task to be run in the background."""
-        temp_file_path = None
-        try:
-            # Download the file
-            response = requests.get(payload.url, stream=True, timeout=60) # 60s timeout
-            response.raise_for_status() # Raise exception for bad status codes
-
-            # Infer filename or use a default
-            filename = os.path.basename(payload.url.split("?")[0]) or "downloaded_file"
-
-            # Ensure filename has an extension if possible
-            content_type = response.headers.get('content-type')
-            ext = ""
-            if content_type:
-                if 'pdf' in content_type:
-                    ext = ".pdf"
-                elif 'text/plain' in content_type:
-                    ext = ".txt"
-                # Add more content-type checks as needed
-            
-            if not os.path.splitext(filename)[1] and ext:
-                filename += ext
-            
-            # Save to a temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as temp_file:
-                temp_file_path = temp_file.name
-                for chunk in response.iter_content(chunk_size=8192):
-                    temp_file.write(chunk)
-            
-            logger.info(f"Successfully downloaded file from {payload.url} to {temp_file_path}")
-
-            # Combine original metadata with source URL
-            final_metadata = {"source_url": payload.url}
-            if payload.metadata:
-                final_metadata.update(payload.metadata)
+    # Infer filename or use a default
+    file_name = os.path.basename(payload.url.split("?")[0]) or "downloaded_file"
 
-            # Read the content back for processing
-            with open(temp_file_path, 'rb') as downloaded_file:
-                file_content = downloaded_file.read()
-            
-            # Process the downloaded file
-            result = ingestor.process_upload(file_content, filename, final_metadata)
-            logger.info(f"Background processing result for {payload.url}: {result}")
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error downloading from URL {payload.url}: {e}")
-        except Exception as e:
-            logger.error(f"Error processing downloaded file from URL {payload.url}: {e}", exc_info=True)
-        finally:
-            # Clean up the temporary file
-            if temp_file_path and os.path.exists(temp_file_path):
-                try:
-                    os.remove(temp_file_path)
-                    logger.info(f"Cleaned up temporary file: {temp_file_path}")
-                except Exception as e:
-                    logger.error(f"Error cleaning up temporary file {temp_file_path}: {e}")
+    if not background:
+        # Download and process within the request, returning the result
+        result = await _ingest_url(payload.url, payload.metadata, file_name)
+        _invalidate_status_cache()
+        response.status_code = 200
+        return _processing_response(result)
 
     # Add the task to run in the background
-    background_tasks.add_task(process_url_task)
+    task_id = _create_task(file_name)
+    background_tasks.add_task(_run_url_task, task_id, payload.url, payload.metadata, file_name)
 
     # Return an initial response indicating acceptance
-    return models.ProcessingResponse(
-        success=True, # Indicates the request was accepted
-        message=f"Processing started for URL: {payload.url}",
-        file_name=os.path.basename(payload.url.split("?")[0]) or "downloaded_file"
-    ) 
\ No newline at end of file
+    return _processing_response({
+        "success": True, # Indicates the request was accepted
+        "message": f"Processing started for URL: {payload.url}",
+        "file_name": file_name,
+        "task_id": task_id
+    }) 
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+Service-level micro-batching of embedding and upsert calls.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .config import settings
+
+
+class MicroBatcher(ABC):
+    """
+    Coalesce items submitted by concurrent callers into batches.
+
+    Items wait in a pending list until it holds ``batch_size`` items or
+    ``timeout`` seconds have passed since the first of them arrived, then
+    up to ``batch_size`` of them are handed to ``_process_batch`` in one
+    call. Batches are processed one at a time, so items that arrive while
+    a batch is running gather into the next one. Each caller gets back the
+    results for its own items, in order.
+    """
+    
+    def __init__(self, batch_size: int, timeout: float):
+        """
+        Initialize the batcher.
+
+        Args:
+            batch_size: Maximum number of items per batch
+            timeout: Seconds to wait for a batch to fill
+        """
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._pending: List[tuple] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Optional[asyncio.Task] = None
+    
+    async def submit(self, items: List[Any]) -> List[Any]:
+        """
+        Queue items for the next batches and wait for their results.
+
+        Args:
+            items: Items to process
+
+        Returns:
+            One result per item, in the order of ``items``
+        """
+        loop = asyncio.get_running_loop()
+        futures = []
+        
+        for item in items:
+            future = loop.create_future()
+            self._pending.append((item, future))
+            futures.append(future)
+        
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._pending and self._timer is None:
+            self._timer = loop.call_later(self.timeout, self._flush)
+        
+        return await asyncio.gather(*futures)
+    
+    def _flush(self):
+        """Start processing the oldest pending items unless a batch is already running."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        if self._running is not None or not self._pending:
+            return
+        
+        batch = self._pending[:self.batch_size]
+        self._pending = self._pending[self.batch_size:]
+        self._running = asyncio.create_task(self._run(batch))
+    
+    async def _run(self, batch: List[tuple]):
+        """Process one batch, resolve its callers' futures and start the next one."""
+        try:
+            results = await self._process_batch([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._running = None
+            # Items that arrived during this batch have waited long enough
+            self._flush()
+    
+    @abstractmethod
+    async def _process_batch(self, items: List[Any]) -> List[Any]:
+        """
+        Process one batch of items.
+
+        Args:
+            items: Items from one or more callers
+
+        Returns:
+            One result per item
+        """
+        pass
+
+
+class EmbedQueue(MicroBatcher):
+    """Embed chunks from concurrent ingestions in shared micro-batches."""
+    
+    def __init__(self, embedder, batch_size: Optional[int] = None, timeout: Optional[float] = None):
+        """
+        Initialize the queue.
+
+        Args:
+            embedder: Embedder used for each batch
+            batch_size: Chunks per embedding call
+            timeout: Seconds to wait for a batch to fill
+        """
+        super().__init__(
+            batch_size or settings.embedding.microbatch_size,
+            timeout or settings.embedding.microbatch_timeout
+        )
+        self.embedder = embedder
+    
+    async def embed(self, chunks: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Embed chunks as part of the next batches.
+
+        Args:
+            chunks: Chunks with text and metadata
+
+        Returns:
+            Array with one embedding per chunk
+        """
+        if not chunks:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack(await self.submit(chunks))
+    
+    async def _process_batch(self, items: List[Dict[str, Any]]) -> List[np.ndarray]:
+        embeddings = await asyncio.to_thread(self.embedder.embed_chunks, items, False)
+        return list(embeddings)
+
+
+class UpsertQueue(MicroBatcher):
+    """
+    Write embedded chunks from concurrent ingestions in shared upserts.
+
+    A batch holds enough points for QDRANT_UPSERT_CONCURRENCY upserts of
+    QDRANT_UPSERT_BATCH_SIZE points, which the storage sends concurrently.
+    """
+    
+    def __init__(self, storage, batch_size: Optional[int] = None, timeout: Optional[float] = None):
+        """
+        Initialize the queue.
+
+        Args:
+            storage: Storage used for each batch
+            batch_size: Points per batch
+            timeout: Seconds to wait for a batch to fill
+        """
+        super().__init__(
+            batch_size or settings.qdrant.upsert_batch_size * settings.qdrant.upsert_concurrency,
+            timeout or settings.embedding.microbatch_timeout
+        )
+        self.storage = storage
+    
+    async def store(self, chunks: List[Dict[str, Any]], embeddings: np.ndarray) -> List[str]:
+        """
+        Store chunks as part of the next upserts.
+
+        Args:
+            chunks: Chunks with text and metadata
+            embeddings: One embedding per chunk
+
+        Returns:
+            IDs of the stored chunks
+        """
+        return await self.submit(list(zip(chunks, embeddings)))
+    
+    async def _process_batch(self, items: List[tuple]) -> List[str]:
+        chunks = [chunk for chunk, _ in items]
+        embeddings = np.stack([embedding for _, embedding in items])
+        return await self.storage.aupsert_batches(chunks, embeddings)
@@ -2,13 +2,107 @@
 Document chunking utilities.
 """
 
+from functools import lru_cache
 from typing import List, Dict, Any
 import re
+import threading
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 from .config import settings
 
+try:
+    import hyperscan
+except ImportError:  # Optional; header detection falls back to re
+    hyperscan = None
+
+# Markdown and HTML headers, tried in order when picking a chunk title
+_HEADER_PATTERNS = [
+    re.compile(r"^#{1,6}\s+(.+)$", re.MULTILINE),              # Markdown headers
+    re.compile(r"<h[1-6][^>]*>([^<]+)</h[1-6]>", re.MULTILINE),  # HTML headers
+]
+
+# Whitespace following the end of a sentence
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def _build_header_database():
+    """Compile all header patterns into one hyperscan database, if hyperscan is installed."""
+    if hyperscan is None:
+        return None
+    
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[pattern.pattern.encode() for pattern in _HEADER_PATTERNS],
+        ids=list(range(len(_HEADER_PATTERNS))),
+        flags=[hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP] * len(_HEADER_PATTERNS)
+    )
+    return database
+
+
+_HEADER_DATABASE = _build_header_database()
+
+# Hyperscan scratch space can't be shared between threads scanning at once
+_scratch = threading.local()
+
+
+def _candidate_header_patterns(text: str) -> List[re.Pattern]:
+    """
+    Return the header patterns that can match the text, in order of preference.
+
+    With hyperscan installed, every pattern is checked in a single pass over
+    the text, so chunks without headers (the common case) skip the
+    per-pattern re searches entirely.
+
+    Args:
+        text: The chunk text
+
+    Returns:
+        Header patterns worth searching with re to extract the title
+    """
+    if _HEADER_DATABASE is None:
+        return _HEADER_PATTERNS
+    
+    scratch = getattr(_scratch, "value", None)
+    if scratch is None:
+        scratch = _scratch.value = hyperscan.Scratch(_HEADER_DATABASE)
+    
+    matched = set()
+    
+    def on_match(pattern_id, start, end, flags, context):
+        matched.add(pattern_id)
+        # The first pattern wins whenever it matches, so stop scanning
+        return pattern_id == 0
+    
+    try:
+        _HEADER_DATABASE.scan(text.encode("utf-8"), match_event_handler=on_match, scratch=scratch)
+    except hyperscan.ScanTerminated:
+        pass
+    except (UnicodeEncodeError, hyperscan.HyperscanError):
+        return _HEADER_PATTERNS
+    
+    return [pattern for pattern_id, pattern in enumerate(_HEADER_PATTERNS) if pattern_id in matched]
+
+
+@lru_cache(maxsize=1)
+def _get_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    """
+    Return a text splitter for the given settings, reused across calls.
+
+    Args:
+        chunk_size: Maximum chunk size in characters
+        chunk_overlap: Overlap between consecutive chunks in characters
+
+    Returns:
+        The text splitter
+    """
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        separators=["\n\n", "\n", ". ", " ", ""]
+    )
+
 
 def create_chunks(text: str, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
@@ -21,12 +115,10 @@ def create_chunks(text: str, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
     Returns:
         List of dictionaries containing chunk text and metadata
     """
-    # Create text splitter with settings from config
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=settings.chunking.chunk_size,
-        chunk_overlap=settings.chunking.chunk_overlap,
-        length_function=len,
-        separators=["\n\n", "\n", ". ", " ", ""]
+    # Get the text splitter for the configured settings
+    text_splitter = _get_splitter(
+        settings.chunking.chunk_size,
+        settings.chunking.chunk_overlap
     )
     
     # Split the text into chunks
@@ -34,21 +126,19 @@ def create_chunks(text: str, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
     
     # Create chunks with metadata
     chunks = []
+    total = len(texts)
+    last = total - 1
     for i, chunk_text in enumerate(texts):
-        # Create a copy of the metadata for each chunk
-        chunk_metadata = metadata.copy()
-        
-        # Add chunk-specific metadata
-        chunk_metadata["chunk_id"] = i
-        chunk_metadata["chunk_total"] = len(texts)
-        
         # Add approximate location marker (beginning, middle, end)
         if i == 0:
-            chunk_metadata["location"] = "beginning"
-        elif i == len(texts) - 1:
-            chunk_metadata["location"] = "end"
+            location = "beginning"
+        elif i == last:
+            location = "end"
         else:
-            chunk_metadata["location"] = "middle"
+            location = "middle"
+        
+        # Merge the document metadata with the chunk-specific fields in one step
+        chunk_metadata = {**metadata, "chunk_id": i, "chunk_total": total, "location": location}
         
         # Try to extract a meaningful title for the chunk
         chunk_title = extract_chunk_title(chunk_text)
@@ -77,19 +167,14 @@ def extract_chunk_title(text: str, max_length: int = 100) -> str:
         A title for the chunk
     """
     # Look for markdown/HTML style headers
-    header_patterns = [
-        r"^#{1,6}\s+(.+)$",                 # Markdown headers
-        r"<h[1-6][^>]*>([^<]+)</h[1-6]>",   # HTML headers
-    ]
-    
-    for pattern in header_patterns:
-        match = re.search(pattern, text, re.MULTILINE)
+    for pattern in _candidate_header_patterns(text):
+        match = pattern.search(text)
         if match:
             title = match.group(1).strip()
             return title[:max_length] if len(title) > max_length else title
     
     # If no headers found, use the first sentence or part of it
-    sentences = re.split(r'(?<=[.!?])\s+', text.strip())
+    sentences = _SENTENCE_END.split(text.strip(), maxsplit=1)
     if sentences:
         first_sentence = sentences[0].strip()
         if first_sentence:
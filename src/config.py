@@ -3,46 +3,106 @@ Configuration settings for the Hermes Ingestor service.
 """
 
 import os
-from pydantic import BaseModel
+from functools import lru_cache
+from typing import Literal
+from pydantic import Field, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Each field is read from the environment variable named by its alias; fields
+# can still be passed by name when constructing settings directly
+SETTINGS_CONFIG = SettingsConfigDict(extra="ignore", populate_by_name=True, protected_namespaces=())
 
-class QdrantSettings(BaseModel):
+
+class QdrantSettings(BaseSettings):
     """Settings for Qdrant vector database connection."""
-    host: str = os.getenv("QDRANT_HOST", "localhost")
-    port: int = int(os.getenv("QDRANT_PORT", "6333"))
-    collection_name: str = os.getenv("QDRANT_COLLECTION", "documents")
-    prefer_grpc: bool = os.getenv("QDRANT_PREFER_GRPC", "True").lower() == "true"
-    api_key: str = os.getenv("QDRANT_API_KEY", "")
+    model_config = SETTINGS_CONFIG
+    
+    host: str = Field("localhost", validation_alias="QDRANT_HOST")
+    port: int = Field(6333, validation_alias="QDRANT_PORT")
+    collection_name: str = Field("documents", validation_alias="QDRANT_COLLECTION")
+    prefer_grpc: bool = Field(True, validation_alias="QDRANT_PREFER_GRPC")
+    api_key: str = Field("", validation_alias="QDRANT_API_KEY")
+    timeout: int = Field(60, validation_alias="QDRANT_TIMEOUT")  # Seconds per request
+    pool_size: int = Field(64, validation_alias="QDRANT_POOL_SIZE")  # Connections (REST) or channels (gRPC) per client
+    quantization: bool = Field(True, validation_alias="QDRANT_QUANTIZATION")  # int8 scalar quantization for new collections
+    vector_datatype: Literal["float32", "float16"] = Field("float16", validation_alias="QDRANT_VECTOR_DATATYPE")  # Stored vector precision for new collections
+    hnsw_m: int = Field(64, validation_alias="QDRANT_HNSW_M")  # HNSW graph degree for new collections
+    hnsw_ef_construct: int = Field(256, validation_alias="QDRANT_HNSW_EF_CONSTRUCT")  # HNSW build-time search width
+    upsert_batch_size: int = Field(256, validation_alias="QDRANT_UPSERT_BATCH_SIZE")  # Points per upsert in batch ingestion
+    upsert_concurrency: int = Field(4, validation_alias="QDRANT_UPSERT_CONCURRENCY")  # Upserts in flight at once for large stores
 
 
-class EmbeddingSettings(BaseModel):
+class EmbeddingSettings(BaseSettings):
     """Settings for embedding model."""
-    model_name: str = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
-    batch_size: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
-    dimensions: int = int(os.getenv("EMBEDDING_DIMENSIONS", "384"))  # Default for all-MiniLM-L6-v2
+    model_config = SETTINGS_CONFIG
+    
+    model_name: str = Field("all-MiniLM-L6-v2", validation_alias="EMBEDDING_MODEL")
+    backend: Literal["torch", "onnx", "openvino"] = Field("torch", validation_alias="EMBEDDING_BACKEND")
+    model_file: str = Field("", validation_alias="EMBEDDING_MODEL_FILE")  # e.g. onnx/model_qint8_avx512_vnni.onnx
+    batch_size: int = Field(32, validation_alias="EMBEDDING_BATCH_SIZE")
+    dimensions: int = Field(384, validation_alias="EMBEDDING_DIMENSIONS")  # Default for all-MiniLM-L6-v2
+    microbatch_size: int = Field(64, validation_alias="EMBEDDING_MICROBATCH_SIZE")  # Chunks per embedding call in batch ingestion
+    microbatch_timeout: float = Field(0.05, validation_alias="EMBEDDING_MICROBATCH_TIMEOUT")  # Seconds to wait for a full micro-batch
 
 
-class ChunkingSettings(BaseModel):
+class ChunkingSettings(BaseSettings):
     """Settings for document chunking."""
-    chunk_size: int = int(os.getenv("CHUNK_SIZE", "1000"))
-    chunk_overlap: int = int(os.getenv("CHUNK_OVERLAP", "200"))
+    model_config = SETTINGS_CONFIG
+    
+    chunk_size: int = Field(1000, validation_alias="CHUNK_SIZE")
+    chunk_overlap: int = Field(200, validation_alias="CHUNK_OVERLAP")
 
 
-class AppSettings(BaseModel):
+class AppSettings(BaseSettings):
     """Main application settings."""
+    model_config = SETTINGS_CONFIG
+    
     app_name: str = "Hermes Ingestor"
-    debug: bool = os.getenv("DEBUG", "False").lower() == "true"
-    upload_folder: str = os.getenv("UPLOAD_FOLDER", "uploads")
-    supported_formats: list[str] = ["pdf", "txt", "md", "html", "docx"]
-    max_file_size_mb: int = int(os.getenv("MAX_FILE_SIZE_MB", "50"))
-    qdrant: QdrantSettings = QdrantSettings()
-    embedding: EmbeddingSettings = EmbeddingSettings()
-    chunking: ChunkingSettings = ChunkingSettings()
+    debug: bool = Field(False, validation_alias="DEBUG")
+    enable_docs: bool = Field(True, validation_alias="ENABLE_DOCS")  # Serve /docs, /redoc and /openapi.json
+    upload_folder: str = Field("uploads", validation_alias="UPLOAD_FOLDER")
+    supported_formats: frozenset[str] = frozenset(["pdf", "txt", "md", "html", "docx"])
+    max_file_size_mb: int = Field(50, validation_alias="MAX_FILE_SIZE_MB")
+    ingest_processes: int = Field(0, validation_alias="INGEST_PROCESSES")  # Worker processes for ingestion, 0 uses threads
+    extract_processes: int = Field("auto", validation_alias="EXTRACT_PROCESSES", validate_default=True)  # Processes extracting text in process_files, 0 or 1 extracts serially
+    max_parallel_ingest: int = Field(4, validation_alias="MAX_PARALLEL_INGEST")  # Files processed at once per batch
+    ingest_read_concurrency: int = Field(10, validation_alias="INGEST_READ_CONCURRENCY")  # Uploads saved to disk at once per batch
+    api_key: str = Field("", validation_alias="API_KEY")  # Comma-separated list of accepted keys
+    rate_limit_requests: int = Field(100, validation_alias="RATE_LIMIT_REQUESTS")
+    rate_limit_window: int = Field(60, validation_alias="RATE_LIMIT_WINDOW")  # Seconds
+    redis_url: str = Field("", validation_alias="REDIS_URL")  # Shared rate limit state when set
+    audit_log_path: str = Field("audit.log", validation_alias="AUDIT_LOG_PATH")
+    status_cache_ttl: float = Field(10, validation_alias="STATUS_CACHE_TTL")  # Seconds
+    health_cache_ttl: float = Field(5, validation_alias="HEALTH_CACHE_TTL")  # Seconds
+    health_check_timeout: float = Field(0.5, validation_alias="HEALTH_CHECK_TIMEOUT")  # Seconds
+    qdrant: QdrantSettings = Field(default_factory=QdrantSettings)
+    embedding: EmbeddingSettings = Field(default_factory=EmbeddingSettings)
+    chunking: ChunkingSettings = Field(default_factory=ChunkingSettings)
+
+    @field_validator("ingest_processes", "extract_processes", mode="before")
+    @classmethod
+    def _parse_process_count(cls, value):
+        """Accept "auto" for one worker process per CPU core, leaving one for the server."""
+        if isinstance(value, str) and value.strip().lower() == "auto":
+            return max((os.cpu_count() or 1) - 1, 1)
+        return value
+
+    @field_validator("supported_formats", mode="after")
+    @classmethod
+    def _normalize_formats(cls, value: frozenset[str]) -> frozenset[str]:
+        """Lowercase supported formats so extension checks are a plain set lookup."""
+        return frozenset(fmt.lower() for fmt in value)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> AppSettings:
+    """Return the settings for this process, read from the environment once."""
+    return AppSettings()
 
 
 # Global settings instance
-settings = AppSettings() 
\ No newline at end of file
+settings = get_settings() 
\ No newline at end of file
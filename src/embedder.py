@@ -2,13 +2,20 @@
 Text embedding utilities.
 """
 
-from typing import List, Dict, Any
+import threading
+from typing import TYPE_CHECKING, List, Dict, Any
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from tqdm import tqdm
 
 from .config import settings
 
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+# Loaded models by (model name, backend, model file), shared by every
+# Embedder in the process so the weights are loaded once
+_models: Dict[tuple, "SentenceTransformer"] = {}
+_models_lock = threading.Lock()
+
 
 class Embedder:
     """Class for creating text embeddings."""
@@ -21,14 +28,59 @@ class Embedder:
             model_name: Name of the embedding model to use
         """
         self.model_name = model_name or settings.embedding.model_name
-        self.model = SentenceTransformer(self.model_name)
+        self.backend = settings.embedding.backend
+        
+        # Reuse the process's model, loading it if needed
+        key = (self.model_name, self.backend, settings.embedding.model_file)
+        with _models_lock:
+            self.model = _models.get(key)
+            if self.model is None:
+                self.model = _models[key] = self._load_model()
+        
         self.batch_size = settings.embedding.batch_size
         self.dimension = settings.embedding.dimensions
     
+    def _load_model(self) -> "SentenceTransformer":
+        """
+        Load the embedding model for the configured backend.
+
+        torch and sentence-transformers take seconds to import, so they are
+        imported here rather than with the module. Processes that only
+        extract text, like the process_files workers, never load them.
+
+        Returns:
+            SentenceTransformer: The loaded model
+        """
+        import torch
+        from sentence_transformers import SentenceTransformer
+        
+        if self.backend == "torch":
+            model = SentenceTransformer(self.model_name)
+            
+            # Half precision halves GPU memory traffic; CPUs gain nothing from it
+            if torch.cuda.is_available():
+                model.half()
+            return model
+        
+        # ONNX Runtime / OpenVINO run an exported, optimized graph, which
+        # is considerably faster than eager PyTorch on CPU. A quantized
+        # export can be picked with EMBEDDING_MODEL_FILE.
+        model_kwargs = {}
+        if settings.embedding.model_file:
+            model_kwargs["file_name"] = settings.embedding.model_file
+        return SentenceTransformer(
+            self.model_name,
+            backend=self.backend,
+            model_kwargs=model_kwargs or None
+        )
+    
     def embed_texts(self, texts: List[str], show_progress: bool = True) -> np.ndarray:
         """
         Create embeddings for a list of texts.
 
+        Each distinct text goes through the model once, however often it
+        appears in the list.
+
         Args:
             texts: List of texts to embed
             show_progress: Whether to show a progress bar
@@ -39,40 +91,48 @@ class Embedder:
         if not texts:
             return np.array([])
         
-        # Use tqdm for progress bar if requested
-        iterator = tqdm(range(0, len(texts), self.batch_size), desc="Embedding") if show_progress else range(0, len(texts), self.batch_size)
-        
-        all_embeddings = []
-        for batch_start in iterator:
-            batch_end = min(batch_start + self.batch_size, len(texts))
-            batch_texts = texts[batch_start:batch_end]
-            
-            # Create embeddings for the batch
-            batch_embeddings = self.model.encode(batch_texts, convert_to_numpy=True)
-            all_embeddings.append(batch_embeddings)
+        # Encode repeated texts (boilerplate headers and footers shared by
+        # documents) once, and copy their rows back into place
+        unique = {text: i for i, text in enumerate(dict.fromkeys(texts))}
         
-        # Concatenate all batches
-        return np.vstack(all_embeddings)
+        # Let sentence-transformers do the batching and return one array.
+        # encode() already sorts texts by length before batching (and restores
+        # the input order), so padding is minimal without sorting here.
+        embeddings = self.model.encode(
+            list(unique) if len(unique) < len(texts) else texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=show_progress,
+            normalize_embeddings=True
+        )
+        if len(unique) < len(texts):
+            embeddings = embeddings[[unique[text] for text in texts]]
+        return embeddings
     
-    def embed_chunks(self, chunks: List[Dict[str, Any]], show_progress: bool = True) -> List[Dict[str, Any]]:
+    def embed_chunks(self, chunks: List[Dict[str, Any]], show_progress: bool = True) -> np.ndarray:
         """
         Create embeddings for a list of document chunks.
 
+        The embeddings are returned as one array instead of being added to
+        each chunk, so they can be sliced into upsert batches; they are only
+        converted to Python lists when a batch is built for Qdrant.
+
         Args:
             chunks: List of chunks (each with 'text' and 'metadata')
             show_progress: Whether to show a progress bar
 
         Returns:
-            List of chunks with added embeddings
+            numpy.ndarray: Array of embeddings, one row per chunk
         """
-        # Extract texts from chunks
-        texts = [chunk["text"] for chunk in chunks]
-        
-        # Create embeddings
-        embeddings = self.embed_texts(texts, show_progress)
-        
-        # Add embeddings to chunks
-        for i, chunk in enumerate(chunks):
-            chunk["embedding"] = embeddings[i].tolist()
-        
-        return chunks 
\ No newline at end of file
+        return self.embed_texts([chunk["text"] for chunk in chunks], show_progress)
+    
+    def warm_up(self):
+        """
+        Run one full-size batch through the model.
+
+        The first forward pass pays for lazy initialization (CUDA context,
+        kernel selection, ONNX/OpenVINO graph compilation); doing it here
+        keeps that cost off the first request. The texts are distinct,
+        since embed_texts encodes repeated texts only once.
+        """
+        self.embed_texts([f"warmup {i}" for i in range(self.batch_size)], show_progress=False)
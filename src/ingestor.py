@@ -2,14 +2,22 @@
 Document ingestion pipeline.
 """
 
+import asyncio
+import multiprocessing
 import os
 import logging
+import queue
+import threading
 import time
-from typing import List, Dict, Any, Optional, Union
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Dict, Any, Optional, Tuple, Union
 import shutil
 import tempfile
+import numpy as np
 
-from .processors.factory import get_processor
+from .batching import EmbedQueue, UpsertQueue
+from .processors.factory import get_processor, is_supported
 from .chunker import create_chunks
 from .embedder import Embedder
 from .storage import QdrantStorage
@@ -17,14 +25,42 @@ from .config import settings
 
 logger = logging.getLogger(__name__)
 
+# Buffer size used when copying uploads to disk; large enough that big
+# uploads land in few read/write calls, and writes this size bypass the
+# file object's own buffer
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Chunked files extracted ahead of the embedder in process_files
+EXTRACT_QUEUE_SIZE = 4
+
+# Worker processes extracting text for process_files, started on first use
+# and kept for later calls, see _get_extract_pool
+_extract_pool: Optional[ProcessPoolExecutor] = None
+_extract_pool_lock = threading.Lock()
+
+# Ingestor owned by an ingest pool worker process, see init_worker
+_worker_ingestor: Optional["Ingestor"] = None
+
 
 class Ingestor:
     """Main document ingestion pipeline."""
+    
+    def __init__(self, qdrant_batch_size: Optional[int] = None):
+        """
+        Initialize the ingestor with default components.
 
-    def __init__(self):
-        """Initialize the ingestor with default components."""
+        Args:
+            qdrant_batch_size: Points per Qdrant upsert (default
+                QDRANT_UPSERT_BATCH_SIZE)
+        """
+        self.qdrant_batch_size = qdrant_batch_size or settings.qdrant.upsert_batch_size
         self.embedder = Embedder()
-        self.storage = QdrantStorage()
+        self.storage = QdrantStorage(upsert_batch_size=self.qdrant_batch_size)
+        self.embed_queue = EmbedQueue(self.embedder)
+        self.upsert_queue = UpsertQueue(
+            self.storage,
+            batch_size=self.qdrant_batch_size * settings.qdrant.upsert_concurrency
+        )
         self.upload_dir = settings.upload_folder
         
         # Create upload directory if it doesn't exist
@@ -49,41 +85,30 @@ class Ingestor:
         """
         start_time = time.time()
         
+        # Turn unsupported files away before any disk access
+        if not is_supported(file_path):
+            error = _unsupported(file_path)
+            logger.error("Error processing file %s: %s", file_path, error)
+            return self._failed_result(file_path, error)
+        
         try:
-            # Get the appropriate processor for the file
-            processor = get_processor(file_path)
-            if not processor:
-                raise ValueError(f"Unsupported file type: {file_path}")
-            
-            # Extract text and metadata from the document
-            logger.info(f"Extracting text from {file_path}")
-            document_text = processor.extract_text()
-            
-            # Extract metadata
-            document_metadata = processor.extract_metadata()
-            
-            # Add additional metadata if provided
-            if metadata:
-                document_metadata.update(metadata)
-            
-            # Add ingestion timestamp
-            document_metadata["ingested_at"] = time.time()
-            
-            # Create chunks from the document
-            logger.info(f"Chunking document: {file_path}")
-            chunks = create_chunks(document_text, document_metadata)
+            chunks = self.prepare_chunks(file_path, metadata)
             
             # Create embeddings for the chunks
-            logger.info(f"Creating embeddings for {len(chunks)} chunks")
-            embedded_chunks = self.embedder.embed_chunks(chunks)
+            logger.info("Creating embeddings for %d chunks", len(chunks))
+            embeddings = self.embedder.embed_chunks(chunks)
             
             # Store chunks in the vector database
-            logger.info(f"Storing {len(embedded_chunks)} chunks in Qdrant")
-            chunk_ids = self.storage.store_chunks(embedded_chunks)
+            logger.info("Storing %d chunks in Qdrant", len(chunks))
+            chunk_ids = self.storage.store_chunks(chunks, embeddings)
+            
+            # Upserts are sent without waiting; wait until Qdrant has applied
+            # them, so the chunks are searchable and apply errors surface here
+            self.storage.flush()
             
             # Clean up if requested
             if delete_after and os.path.exists(file_path):
-                logger.info(f"Deleting processed file: {file_path}")
+                logger.info("Deleting processed file: %s", file_path)
                 os.remove(file_path)
             
             # Calculate processing time
@@ -100,7 +125,7 @@ class Ingestor:
             }
         
         except Exception as e:
-            logger.error(f"Error processing file {file_path}: {str(e)}", exc_info=True)
+            logger.error("Error processing file %s: %s", file_path, e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return {
                 "success": False,
                 "file_path": file_path,
@@ -108,7 +133,27 @@ class Ingestor:
                 "error": str(e)
             }
     
-    def process_upload(
+    def prepare_chunks(
+        self,
+        file_path: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract the text of a document and split it into chunks.
+
+        Args:
+            file_path: Path to the document file
+            metadata: Additional metadata to include with the document
+
+        Returns:
+            List of chunks with text and metadata, ready to embed
+
+        Raises:
+            ValueError: If the file type is not supported
+        """
+        return prepare_file_chunks(file_path, metadata)
+    
+    async def process_upload(
         self,
         file_obj: Any,
         filename: str,
@@ -117,6 +162,11 @@ class Ingestor:
         """
         Process an uploaded file.
 
+        File-like objects are copied to disk in UPLOAD_CHUNK_SIZE pieces, so
+        the upload is never held in memory as a whole. The file is then
+        processed with process_saved_upload_batched, whose upserts run
+        concurrently without blocking the event loop.
+
         Args:
             file_obj: The file object (bytes or file-like object)
             filename: Name of the file
@@ -125,26 +175,149 @@ class Ingestor:
         Returns:
             Dict with processing results
         """
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as tmp:
-            # Write the file content - handle both bytes and file-like objects
-            if isinstance(file_obj, bytes):
-                # If it's already bytes, just write it
-                tmp.write(file_obj)
-            else:
-                # If it's a file-like object, use copyfileobj
-                shutil.copyfileobj(file_obj, tmp)
-            tmp_path = tmp.name
+        # Don't copy an upload to disk only to reject it
+        if not is_supported(filename):
+            return self._failed_result(filename, _unsupported(filename))
+        
+        tmp_path = await asyncio.to_thread(self.save_upload, file_obj, filename)
+        return await self.process_saved_upload_batched(tmp_path, metadata)
+    
+    def save_upload(self, file_obj: Any, filename: str) -> str:
+        """
+        Write an uploaded file to a private temporary directory.
+
+        The original file name is kept so it ends up in the document metadata.
+
+        Args:
+            file_obj: The file object (bytes or file-like object)
+            filename: Name of the file
+
+        Returns:
+            Path of the saved file
+        """
+        tmp_path = self.upload_path(filename)
+        
+        try:
+            with open(tmp_path, "wb") as tmp:
+                # Write the file content - handle both bytes and file-like objects
+                if isinstance(file_obj, bytes):
+                    # If it's already bytes, write it in one call
+                    tmp.write(file_obj)
+                else:
+                    # If it's a file-like object, stream it in chunks
+                    shutil.copyfileobj(file_obj, tmp, UPLOAD_CHUNK_SIZE)
+        except Exception:
+            shutil.rmtree(os.path.dirname(tmp_path), ignore_errors=True)
+            raise
+        
+        return tmp_path
+    
+    def upload_path(self, filename: str) -> str:
+        """
+        Create a private temporary directory for an upload.
+
+        Args:
+            filename: Name of the file
+
+        Returns:
+            Path the upload should be written to, keeping its original file name
+        """
+        tmp_dir = tempfile.mkdtemp()
+        return os.path.join(tmp_dir, os.path.basename(filename) or "upload")
+    
+    def process_saved_upload(
+        self,
+        tmp_path: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Process a file written by save_upload and remove its temporary directory.
+
+        Args:
+            tmp_path: Path returned by save_upload
+            metadata: Additional metadata to include
+
+        Returns:
+            Dict with processing results
+        """
+        try:
+            return self.process_file(tmp_path, metadata, delete_after=True)
+        finally:
+            # Clean up the temporary directory and anything left in it
+            shutil.rmtree(os.path.dirname(tmp_path), ignore_errors=True)
+    
+    async def process_saved_upload_batched(
+        self,
+        tmp_path: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Process a file written by save_upload through the shared batching queues.
+
+        Chunks are embedded and stored together with those of any other
+        upload in flight, instead of with one embedding call and one upsert
+        per document (see embed_and_store). The temporary directory is
+        removed afterwards.
+
+        Args:
+            tmp_path: Path returned by save_upload
+            metadata: Additional metadata to include
+
+        Returns:
+            Dict with processing results, in the format of process_file
+        """
+        start_time = time.time()
         
         try:
-            # Process the temporary file
-            result = self.process_file(tmp_path, metadata, delete_after=True)
-            return result
+            chunks = await asyncio.to_thread(self.prepare_chunks, tmp_path, metadata)
+            chunk_ids = await self.embed_and_store(chunks)
+            await asyncio.to_thread(self.storage.flush)
+            
+            return {
+                "success": True,
+                "file_path": tmp_path,
+                "file_name": os.path.basename(tmp_path),
+                "chunks_created": len(chunks),
+                "processing_time": time.time() - start_time,
+                "chunk_ids": chunk_ids
+            }
+        
         except Exception as e:
-            # Clean up the temporary file in case of error
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-            raise e
+            logger.error("Error processing file %s: %s", tmp_path, e, exc_info=logger.isEnabledFor(logging.DEBUG))
+            return {
+                "success": False,
+                "file_path": tmp_path,
+                "file_name": os.path.basename(tmp_path),
+                "error": str(e)
+            }
+        
+        finally:
+            shutil.rmtree(os.path.dirname(tmp_path), ignore_errors=True)
+    
+    async def embed_and_store(self, chunks: List[Dict[str, Any]]) -> List[str]:
+        """
+        Embed and store chunks through the shared batching queues.
+
+        The chunks go to the embedding queue in micro-batch sized parts, and
+        each part is stored as soon as it is embedded, so upserts run while
+        the rest of the chunks are embedded.
+
+        Args:
+            chunks: Chunks with text and metadata
+
+        Returns:
+            IDs of the stored chunks, in the order of ``chunks``
+        """
+        size = self.embed_queue.batch_size
+        parts = await asyncio.gather(*(
+            self._embed_and_store_part(chunks[i:i + size]) for i in range(0, len(chunks), size)
+        ))
+        return [chunk_id for part in parts for chunk_id in part]
+    
+    async def _embed_and_store_part(self, chunks: List[Dict[str, Any]]) -> List[str]:
+        """Embed and store one micro-batch sized part of a document's chunks."""
+        embeddings = await self.embed_queue.embed(chunks)
+        return await self.upsert_queue.store(chunks, embeddings)
     
     def process_files(
         self,
@@ -155,6 +328,16 @@ class Ingestor:
         """
         Process multiple document files.
 
+        The work runs as three overlapping stages: text extraction (in
+        EXTRACT_PROCESSES worker processes when there is more than one file,
+        otherwise in a background thread), embedding in this thread, and
+        storage in a writer thread. The chunks are collected into one pending
+        list as files finish and embedded in batches of
+        EMBEDDING_MICROBATCH_SIZE, so a directory of small documents doesn't
+        make one embedding call per file. Embedded chunks are written in
+        upserts of ``qdrant_batch_size`` points, again across files, and
+        each upsert runs while the following chunks are embedded.
+
         Args:
             file_paths: List of paths to document files
             metadata: Additional metadata to include with all documents
@@ -163,14 +346,321 @@ class Ingestor:
         Returns:
             List of dicts with processing results for each file
         """
-        results = []
+        batch_size = settings.embedding.microbatch_size
+        store_size = self.qdrant_batch_size
+        results: List[Dict[str, Any]] = [None] * len(file_paths)
+        # When each file's extraction began, filled in as files are chunked
+        start_times: List[Optional[float]] = [None] * len(file_paths)
+        pending: List[Tuple[int, Dict[str, Any]]] = []
+        # Embedded batches waiting for the next upsert
+        embedded: List[Tuple[List[Tuple[int, Dict[str, Any]]], np.ndarray]] = []
+        embedded_count = 0
+        # Batch being written by the writer thread, with its future
+        storing: Optional[Tuple[List[Tuple[int, Dict[str, Any]]], Future]] = None
+        
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="store") as store_executor:
+            for index, start_time, chunks in self._chunk_files(file_paths, metadata):
+                file_path = file_paths[index]
+                start_times[index] = start_time
+                if isinstance(chunks, Exception):
+                    logger.error(
+                        "Error processing file %s: %s", file_path, chunks,
+                        exc_info=chunks if logger.isEnabledFor(logging.DEBUG) else None
+                    )
+                    results[index] = self._failed_result(file_path, chunks)
+                    continue
+                
+                results[index] = {
+                    "success": True,
+                    "file_path": file_path,
+                    "file_name": os.path.basename(file_path),
+                    "chunks_created": len(chunks),
+                    "processing_time": None,
+                    "chunk_ids": []
+                }
+                pending.extend((index, chunk) for chunk in chunks)
+                
+                if not chunks:
+                    self._finish_file(results[index], start_times[index])
+                
+                while len(pending) >= batch_size:
+                    if batch := self._embed_batch(pending[:batch_size], results):
+                        embedded.append(batch)
+                        embedded_count += len(batch[0])
+                    pending = pending[batch_size:]
+                
+                if embedded_count >= store_size:
+                    storing = self._store_embedded(
+                        embedded, results, start_times, store_executor, storing
+                    )
+                    embedded, embedded_count = [], 0
+            
+            if pending and (batch := self._embed_batch(pending, results)):
+                embedded.append(batch)
+            if embedded:
+                storing = self._store_embedded(
+                    embedded, results, start_times, store_executor, storing
+                )
+            if storing:
+                self._record_stored(*storing, results, start_times)
+        
+        self._flush_stored(results)
         
-        for file_path in file_paths:
-            result = self.process_file(file_path, metadata, delete_after)
-            results.append(result)
+        # Only delete files once their chunks are known to be applied, so a
+        # file that failed can still be retried
+        if delete_after:
+            for result in results:
+                if result["success"] and os.path.exists(result["file_path"]):
+                    logger.info("Deleting processed file: %s", result["file_path"])
+                    os.remove(result["file_path"])
         
         return results
     
+    def _flush_stored(self, results: List[Dict[str, Any]]):
+        """
+        Wait until Qdrant has applied the upserts of process_files.
+
+        They are sent without waiting for each one, so this is where an
+        error applying them shows up; it fails every file that was stored.
+
+        Args:
+            results: Result of each file, updated in place
+        """
+        if not any(result["success"] and result["chunks_created"] for result in results):
+            return
+        
+        try:
+            self.storage.flush()
+        except Exception as e:
+            logger.error("Error applying stored chunks: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+            for index, result in enumerate(results):
+                if result["success"]:
+                    results[index] = self._failed_result(result["file_path"], e)
+    
+    def _chunk_files(
+        self,
+        file_paths: List[str],
+        metadata: Optional[Dict[str, Any]]
+    ) -> Iterator[Tuple[int, Optional[float], Union[List[Dict[str, Any]], Exception]]]:
+        """
+        Extract and chunk files, in the extraction process pool when there are several.
+
+        Args:
+            file_paths: List of paths to document files
+            metadata: Additional metadata to include with all documents
+
+        Yields:
+            (file index, time its extraction began or None, chunks or the
+            error raised) in completion order
+        """
+        # Unsupported files fail here rather than in a worker
+        supported = []
+        for index, file_path in enumerate(file_paths):
+            if is_supported(file_path):
+                supported.append(index)
+            else:
+                yield index, None, _unsupported(file_path)
+        
+        workers = min(settings.extract_processes, len(supported))
+        if workers <= 1:
+            for position, start_time, chunks in self._chunk_files_in_thread(
+                [file_paths[index] for index in supported], metadata
+            ):
+                yield supported[position], start_time, chunks
+            return
+        
+        pool = _get_extract_pool()
+        futures = {
+            pool.submit(_prepare_file_chunks_timed, file_paths[index], metadata): index
+            for index in supported
+        }
+        try:
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], *future.result()
+                except BrokenProcessPool as e:
+                    _discard_extract_pool(pool)
+                    yield futures[future], None, e
+                except Exception as e:
+                    yield futures[future], None, e
+        finally:
+            # The pool outlives this call; drop files not started if the caller stopped early
+            for future in futures:
+                future.cancel()
+    
+    def _chunk_files_in_thread(
+        self,
+        file_paths: List[str],
+        metadata: Optional[Dict[str, Any]]
+    ) -> Iterator[Tuple[int, Optional[float], Union[List[Dict[str, Any]], Exception]]]:
+        """
+        Extract and chunk files one by one in a background thread.
+
+        The thread runs up to EXTRACT_QUEUE_SIZE files ahead of the caller,
+        so parsing the next file overlaps embedding the previous one.
+
+        Args:
+            file_paths: List of paths to document files
+            metadata: Additional metadata to include with all documents
+
+        Yields:
+            (file index, time its extraction began, chunks or the error
+            raised) in file order
+        """
+        chunked: queue.Queue = queue.Queue(maxsize=EXTRACT_QUEUE_SIZE)
+        stop = threading.Event()
+        
+        def extract():
+            for index, file_path in enumerate(file_paths):
+                if stop.is_set():
+                    return
+                start_time = time.time()
+                try:
+                    chunked.put((index, start_time, self.prepare_chunks(file_path, metadata)))
+                except Exception as e:
+                    chunked.put((index, start_time, e))
+            chunked.put(None)
+        
+        thread = threading.Thread(target=extract, name="extract", daemon=True)
+        thread.start()
+        try:
+            while (item := chunked.get()) is not None:
+                yield item
+        finally:
+            # Unblock the thread if the caller stopped early
+            stop.set()
+            while thread.is_alive():
+                try:
+                    chunked.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+    
+    def _embed_batch(
+        self,
+        batch: List[Tuple[int, Dict[str, Any]]],
+        results: List[Dict[str, Any]]
+    ) -> Optional[Tuple[List[Tuple[int, Dict[str, Any]]], np.ndarray]]:
+        """
+        Embed one batch of chunks.
+
+        Args:
+            batch: (file index, chunk) pairs, possibly from several files
+            results: Per-file results, updated in place if embedding fails
+
+        Returns:
+            The embedded pairs with their embeddings, or None if nothing was embedded
+        """
+        # Skip chunks of files that failed in an earlier batch
+        batch = [(index, chunk) for index, chunk in batch if results[index]["success"]]
+        if not batch:
+            return None
+        
+        try:
+            logger.info("Creating embeddings for %d chunks", len(batch))
+            return batch, self.embedder.embed_chunks([chunk for _, chunk in batch])
+        except Exception as e:
+            self._fail_files(batch, results, e)
+            return None
+    
+    def _store_embedded(
+        self,
+        embedded: List[Tuple[List[Tuple[int, Dict[str, Any]]], np.ndarray]],
+        results: List[Dict[str, Any]],
+        start_times: List[float],
+        store_executor: ThreadPoolExecutor,
+        storing: Optional[Tuple[List[Tuple[int, Dict[str, Any]]], Future]]
+    ) -> Optional[Tuple[List[Tuple[int, Dict[str, Any]]], Future]]:
+        """
+        Hand embedded batches to the writer thread as one upsert.
+
+        The previous upsert is recorded first, so at most one is in flight.
+
+        Args:
+            embedded: Embedded batches, each with its (file index, chunk) pairs
+            results: Per-file results, updated in place
+            start_times: Processing start time of each file
+            store_executor: Single writer thread for Qdrant upserts
+            storing: Batch currently being stored, with its future
+
+        Returns:
+            The batch now being stored, with its future
+        """
+        if storing:
+            self._record_stored(*storing, results, start_times)
+        
+        # Leave out chunks of files that failed after they were embedded
+        batch = []
+        rows = []
+        for pairs, embeddings in embedded:
+            for (index, chunk), embedding in zip(pairs, embeddings):
+                if results[index]["success"]:
+                    batch.append((index, chunk))
+                    rows.append(embedding)
+        if not batch:
+            return None
+        
+        logger.info("Storing %d chunks in Qdrant", len(batch))
+        chunks = [chunk for _, chunk in batch]
+        return batch, store_executor.submit(self.storage.store_chunks, chunks, np.stack(rows))
+    
+    def _record_stored(
+        self,
+        batch: List[Tuple[int, Dict[str, Any]]],
+        future: Future,
+        results: List[Dict[str, Any]],
+        start_times: List[float]
+    ):
+        """
+        Wait for a batch to be stored and record its chunk IDs in the files' results.
+
+        Args:
+            batch: (file index, chunk) pairs that were stored
+            future: Future of the store_chunks call
+            results: Per-file results, updated in place
+            start_times: Processing start time of each file
+        """
+        try:
+            chunk_ids = future.result()
+        except Exception as e:
+            self._fail_files(batch, results, e)
+            return
+        
+        for (index, _), chunk_id in zip(batch, chunk_ids):
+            result = results[index]
+            if not result["success"]:
+                continue
+            result["chunk_ids"].append(chunk_id)
+            if len(result["chunk_ids"]) == result["chunks_created"]:
+                self._finish_file(result, start_times[index])
+    
+    def _fail_files(
+        self,
+        batch: List[Tuple[int, Dict[str, Any]]],
+        results: List[Dict[str, Any]],
+        error: Exception
+    ):
+        """Mark every file with chunks in a batch as failed."""
+        for index in {index for index, _ in batch}:
+            if results[index]["success"]:
+                logger.error(
+                    "Error processing file %s: %s", results[index]["file_path"], error,
+                    exc_info=error if logger.isEnabledFor(logging.DEBUG) else None
+                )
+                results[index] = self._failed_result(results[index]["file_path"], error)
+    
+    def _finish_file(self, result: Dict[str, Any], start_time: float):
+        """Record the processing time of a fully stored file."""
+        result["processing_time"] = time.time() - start_time
+    
+    def _failed_result(self, file_path: str, error: Exception) -> Dict[str, Any]:
+        """Build the result dict for a file that could not be processed."""
+        return {
+            "success": False,
+            "file_path": file_path,
+            "file_name": os.path.basename(file_path),
+            "error": str(error)
+        }
+    
     def process_directory(
         self,
         directory_path: str,
@@ -195,27 +685,13 @@ class Ingestor:
         if not os.path.isdir(directory_path):
             raise ValueError(f"Not a directory: {directory_path}")
         
-        file_paths = []
         supported_extensions = extensions or settings.supported_formats
         
         # Normalize extensions to lowercase with dot
-        supported_extensions = [f".{ext.lower().lstrip('.')}" for ext in supported_extensions]
+        supported_extensions = frozenset(f".{ext.lower().lstrip('.')}" for ext in supported_extensions)
         
         # Walk through the directory (recursively if requested)
-        if recursive:
-            for root, _, files in os.walk(directory_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    _, ext = os.path.splitext(file_path.lower())
-                    if ext in supported_extensions:
-                        file_paths.append(file_path)
-        else:
-            for file in os.listdir(directory_path):
-                file_path = os.path.join(directory_path, file)
-                if os.path.isfile(file_path):
-                    _, ext = os.path.splitext(file_path.lower())
-                    if ext in supported_extensions:
-                        file_paths.append(file_path)
+        file_paths = list(_iter_files(directory_path, supported_extensions, recursive))
         
         # Process all found files
         return self.process_files(file_paths, metadata, delete_after)
@@ -260,9 +736,151 @@ class Ingestor:
             }
         
         except Exception as e:
-            logger.error(f"Error deleting document: {str(e)}", exc_info=True)
+            logger.error("Error deleting document: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return {
                 "success": False,
                 "error": str(e),
                 "deleted_count": 0
-            } 
\ No newline at end of file
+            }
+
+
+def init_worker():
+    """Load and warm up the embedding model and Qdrant client once in an ingest pool worker process."""
+    global _worker_ingestor
+    _worker_ingestor = Ingestor()
+    _worker_ingestor.embedder.warm_up()
+
+
+def process_saved_upload_in_worker(
+    tmp_path: str,
+    metadata: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Process a saved upload with the worker process's ingestor.
+
+    Args:
+        tmp_path: Path returned by Ingestor.save_upload
+        metadata: Additional metadata to include
+
+    Returns:
+        Dict with processing results
+    """
+    return _worker_ingestor.process_saved_upload(tmp_path, metadata)
+
+
+def _iter_files(directory_path: str, extensions: frozenset, recursive: bool) -> Iterator[str]:
+    """
+    Yield the paths of files in a directory whose extension is in ``extensions``.
+
+    Uses os.scandir, so file types come from the directory listing without a
+    stat call per entry, and compares only the lowercased extension of each
+    name. Symlinked directories are not followed, as with os.walk.
+
+    Args:
+        directory_path: Directory to list
+        extensions: Lowercase extensions including the dot
+        recursive: Whether to descend into subdirectories
+
+    Yields:
+        Paths of matching files
+    """
+    with os.scandir(directory_path) as entries:
+        subdirectories = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if recursive:
+                    subdirectories.append(entry.path)
+            elif entry.is_file():
+                name = entry.name
+                dot = name.rfind(".")
+                if dot > 0 and name[dot:].lower() in extensions:
+                    yield entry.path
+    
+    for subdirectory in subdirectories:
+        yield from _iter_files(subdirectory, extensions, recursive)
+
+
+def _prepare_file_chunks_timed(
+    file_path: str,
+    metadata: Optional[Dict[str, Any]] = None
+) -> Tuple[float, List[Dict[str, Any]]]:
+    """Run prepare_file_chunks in an extraction worker, also returning when it started."""
+    start_time = time.time()
+    return start_time, prepare_file_chunks(file_path, metadata)
+
+
+def _get_extract_pool() -> ProcessPoolExecutor:
+    """
+    Return the extraction process pool, starting it on first use.
+
+    The pool is shared by all process_files calls, so worker processes
+    (and their imports) are started once rather than per call.
+    """
+    global _extract_pool
+    
+    with _extract_pool_lock:
+        if _extract_pool is None:
+            # Spawn rather than fork so children don't inherit the model's threads
+            _extract_pool = ProcessPoolExecutor(
+                max_workers=settings.extract_processes,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _extract_pool
+
+
+def _discard_extract_pool(pool: ProcessPoolExecutor) -> None:
+    """Forget a broken extraction pool, so the next call starts a new one."""
+    global _extract_pool
+    
+    with _extract_pool_lock:
+        if _extract_pool is pool:
+            _extract_pool = None
+    pool.shutdown(wait=False)
+
+
+def prepare_file_chunks(
+    file_path: str,
+    metadata: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Extract the text of a document and split it into chunks.
+
+    Module-level so extraction can run in a process pool, see Ingestor.process_files.
+
+    Args:
+        file_path: Path to the document file
+        metadata: Additional metadata to include with the document
+
+    Returns:
+        List of chunks with text and metadata, ready to embed
+
+    Raises:
+        ValueError: If the file type is not supported
+    """
+    # Get the appropriate processor for the file
+    processor = get_processor(file_path)
+    if not processor:
+        raise _unsupported(file_path)
+    
+    # Extract text and metadata from the document
+    logger.info("Extracting text from %s", file_path)
+    document_text = processor.extract_text()
+    
+    # Extract metadata
+    document_metadata = processor.extract_metadata()
+    
+    # Add additional metadata if provided
+    if metadata:
+        document_metadata.update(metadata)
+    
+    # Add ingestion timestamp
+    document_metadata["ingested_at"] = time.time()
+    
+    # Create chunks from the document
+    logger.info("Chunking document: %s", file_path)
+    return create_chunks(document_text, document_metadata)
+
+
+def _unsupported(file_path: str) -> ValueError:
+    """Build the error for a file that has no processor."""
+    return ValueError(f"Unsupported file type: {file_path}")
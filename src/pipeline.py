@@ -0,0 +1,176 @@
+"""
+Staged ingestion pipeline for batches of documents.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import settings
+from .ingestor import Ingestor
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's input
+_DONE = object()
+
+# Uploads saved to disk ahead of the chunking workers
+LOAD_QUEUE_SIZE = 4
+
+
+class IngestPipeline:
+    """
+    Ingest several documents through overlapping stages.
+
+    Uploads are saved to disk concurrently (load), then ``workers`` tasks
+    each split one saved upload at a time into chunks (transform) and embed
+    and store them through the ingestor's shared EmbedQueue and UpsertQueue.
+    One file is parsed while another is being embedded, and the chunks of
+    every file, like those of any other upload the service is handling,
+    share the same embedding micro-batches and upserts.
+    """
+    
+    def __init__(
+        self,
+        ingestor: Ingestor,
+        workers: Optional[int] = None,
+        read_concurrency: Optional[int] = None
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            ingestor: Ingestor providing the chunking, batching queues and storage
+            workers: Number of files chunked, embedded and stored at once
+            read_concurrency: Number of uploads saved to disk at once
+        """
+        self.ingestor = ingestor
+        self.workers = workers or settings.max_parallel_ingest
+        self.read_concurrency = read_concurrency or settings.ingest_read_concurrency
+    
+    async def run(
+        self,
+        uploads: List[Tuple[Any, str]],
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Ingest a batch of uploaded files.
+
+        Args:
+            uploads: (file object or bytes, file name) for each upload
+            metadata: Additional metadata to include with every document
+
+        Returns:
+            List of dicts with processing results, in the order of ``uploads``
+        """
+        self._metadata = metadata
+        self._documents = [
+            {"file_name": filename, "file_path": None, "start": time.time(),
+             "end": None, "chunk_ids": [], "error": None}
+            for _, filename in uploads
+        ]
+        self._uploads = uploads
+        
+        load_q: asyncio.Queue = asyncio.Queue(maxsize=LOAD_QUEUE_SIZE)
+        
+        try:
+            await asyncio.gather(
+                self._load(load_q),
+                *(self._transform_worker(load_q) for _ in range(self.workers))
+            )
+            await self._flush()
+        finally:
+            for document in self._documents:
+                if document["file_path"]:
+                    shutil.rmtree(os.path.dirname(document["file_path"]), ignore_errors=True)
+        
+        return [self._result(document) for document in self._documents]
+    
+    async def _load(self, load_q: asyncio.Queue):
+        """Save the uploads to disk concurrently and queue each one for chunking as it is ready."""
+        semaphore = asyncio.Semaphore(self.read_concurrency)
+        await asyncio.gather(
+            *(self._load_one(index, load_q, semaphore) for index in range(len(self._uploads)))
+        )
+        
+        for _ in range(self.workers):
+            await load_q.put(_DONE)
+    
+    async def _load_one(self, index: int, load_q: asyncio.Queue, semaphore: asyncio.Semaphore):
+        """Save one upload to disk and queue it for chunking."""
+        file_obj, filename = self._uploads[index]
+        document = self._documents[index]
+        
+        try:
+            async with semaphore:
+                document["file_path"] = await asyncio.to_thread(
+                    self.ingestor.save_upload, file_obj, filename
+                )
+        except Exception as e:
+            self._fail([index], e)
+            return
+        
+        await load_q.put(index)
+    
+    async def _transform_worker(self, load_q: asyncio.Queue):
+        """Chunk saved uploads in a worker thread, then embed and store them through the shared queues."""
+        while True:
+            index = await load_q.get()
+            if index is _DONE:
+                return
+            
+            document = self._documents[index]
+            try:
+                chunks = await asyncio.to_thread(
+                    self.ingestor.prepare_chunks, document["file_path"], self._metadata
+                )
+                document["chunk_ids"] = await self.ingestor.embed_and_store(chunks)
+            except Exception as e:
+                self._fail([index], e)
+                continue
+            
+            document["end"] = time.time()
+    
+    async def _flush(self):
+        """Wait until Qdrant has applied the stored chunks, failing the documents if it can't."""
+        stored = [index for index, document in enumerate(self._documents) if document["chunk_ids"]]
+        if not stored:
+            return
+        
+        try:
+            await asyncio.to_thread(self.ingestor.storage.flush)
+        except Exception as e:
+            self._fail(stored, e)
+    
+    def _fail(self, indexes, error: Exception):
+        """Record an error for the given documents."""
+        for index in indexes:
+            document = self._documents[index]
+            if document["error"] is None:
+                logger.error(
+                    "Error processing file %s: %s", document["file_name"], error,
+                    exc_info=error if logger.isEnabledFor(logging.DEBUG) else None
+                )
+                document["error"] = str(error)
+    
+    def _result(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the result dict for one document, in the format of Ingestor.process_file."""
+        if document["error"] is not None:
+            return {
+                "success": False,
+                "file_path": document["file_path"],
+                "file_name": document["file_name"],
+                "error": document["error"]
+            }
+        
+        return {
+            "success": True,
+            "file_path": document["file_path"],
+            "file_name": document["file_name"],
+            "chunks_created": len(document["chunk_ids"]),
+            "processing_time": (document["end"] or time.time()) - document["start"],
+            "chunk_ids": document["chunk_ids"]
+        }
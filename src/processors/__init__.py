@@ -1,10 +1,33 @@
 """
 Document processors for different file types.
+
+The processor modules pull in heavy parsing libraries, so they are imported
+on first attribute access rather than with the package.
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 from .base import BaseProcessor
-from .pdf import PDFProcessor
-from .markdown import MarkdownProcessor
-from .html import HTMLProcessor
-from .text import TextProcessor
-from .docx import DocxProcessor 
\ No newline at end of file
+
+if TYPE_CHECKING:
+    from .pdf import PDFProcessor
+    from .markdown import MarkdownProcessor
+    from .html import HTMLProcessor
+    from .text import TextProcessor
+    from .docx import DocxProcessor
+
+# Module defining each lazily imported processor class
+_MODULES = {
+    "PDFProcessor": ".pdf",
+    "MarkdownProcessor": ".markdown",
+    "HTMLProcessor": ".html",
+    "TextProcessor": ".text",
+    "DocxProcessor": ".docx",
+}
+
+
+def __getattr__(name: str):
+    if name in _MODULES:
+        return getattr(importlib.import_module(_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
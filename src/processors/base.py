@@ -2,9 +2,27 @@
 Base processor class for document processing.
 """
 
+import mmap
 import os
+import threading
 from abc import ABC, abstractmethod
-from typing import List
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Files whose extracted text and metadata are kept, most recently used last
+EXTRACTED_CACHE_SIZE = 128
+
+# Total length of the cached texts; a few large documents evict older entries
+# before the count limit is reached, and a text longer than this isn't cached
+EXTRACTED_CACHE_MAX_CHARS = 64 * 1024 * 1024
+
+# (text, metadata) of recently processed files, by processor class, path and
+# file identity, so an unchanged file that is processed again (a retry, a
+# re-upload of the same path) isn't read and parsed again
+_extracted: "OrderedDict[tuple, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+_extracted_chars = 0
+_extracted_lock = threading.Lock()
 
 
 class BaseProcessor(ABC):
@@ -20,27 +38,127 @@ class BaseProcessor(ABC):
         self.file_path = file_path
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
+        self._text_cache: Optional[str] = None
+        self._metadata_cache: Optional[Dict[str, Any]] = None
+        self._cache_key: Optional[tuple] = None
 
-    @abstractmethod
     def extract_text(self) -> str:
         """
         Extract text content from the document.
 
+        The document is parsed on the first call only, so extract_metadata
+        can reuse the text for counts without parsing the file again. If the
+        same file was processed recently and hasn't changed since, its text
+        is reused without reading it.
+
+        Returns:
+            str: The extracted text
+        """
+        if self._text_cache is None:
+            self._load_extracted()
+        if self._text_cache is None:
+            self._text_cache = self._extract_text()
+            self._remember_extracted()
+        return self._text_cache
+
+    def extract_metadata(self) -> Dict[str, Any]:
+        """
+        Extract metadata from the document.
+
+        Metadata is extracted on the first call only, or reused like the text
+        for a file processed recently. Each call returns a new dict, so
+        callers can add to it.
+
+        Returns:
+            dict: Document metadata
+        """
+        if self._metadata_cache is None:
+            self._load_extracted()
+        if self._metadata_cache is None:
+            self._metadata_cache = self._extract_metadata()
+            self._remember_extracted()
+        return dict(self._metadata_cache)
+
+    def _load_extracted(self):
+        """Take the text and metadata of this file from the cache, once per processor."""
+        if self._cache_key is not None:
+            return
+        
+        stat = os.stat(self.file_path)
+        self._cache_key = (
+            type(self), self.file_path, stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size
+        )
+        with _extracted_lock:
+            entry = _extracted.get(self._cache_key)
+            if entry is not None:
+                _extracted.move_to_end(self._cache_key)
+        
+        if entry is not None:
+            self._text_cache, self._metadata_cache = entry
+
+    def _remember_extracted(self):
+        """Cache the text and metadata once both have been extracted."""
+        global _extracted_chars
+        
+        if self._text_cache is None or self._metadata_cache is None:
+            return
+        if len(self._text_cache) > EXTRACTED_CACHE_MAX_CHARS:
+            return
+        
+        with _extracted_lock:
+            replaced = _extracted.pop(self._cache_key, None)
+            if replaced is not None:
+                _extracted_chars -= len(replaced[0])
+            _extracted[self._cache_key] = (self._text_cache, self._metadata_cache)
+            _extracted_chars += len(self._text_cache)
+            while len(_extracted) > EXTRACTED_CACHE_SIZE or _extracted_chars > EXTRACTED_CACHE_MAX_CHARS:
+                text, _ = _extracted.popitem(last=False)[1]
+                _extracted_chars -= len(text)
+
+    @abstractmethod
+    def _extract_text(self) -> str:
+        """
+        Parse the text content out of the document.
+
         Returns:
             str: The extracted text
         """
         pass
 
     @abstractmethod
-    def extract_metadata(self) -> dict:
+    def _extract_metadata(self) -> Dict[str, Any]:
         """
-        Extract metadata from the document.
+        Read the metadata of the document.
 
         Returns:
             dict: Document metadata
         """
         pass
 
+    def _read_text(self, errors: str = "strict") -> str:
+        """
+        Read the file as UTF-8 text in a single decode.
+
+        The file is memory-mapped and decoded straight from the mapping, with
+        no intermediate bytes copy, and line endings are normalized to newlines
+        the way text-mode reads do.
+
+        Args:
+            errors: How to handle invalid UTF-8, as for bytes.decode
+
+        Returns:
+            str: The file content
+        """
+        with open(self.file_path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return ""
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                text = str(mapped, "utf-8", errors)
+        
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
+
     def get_file_name(self) -> str:
         """
         Get the file name without extension.
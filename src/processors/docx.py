@@ -3,19 +3,119 @@ Microsoft Word (DOCX) document processor.
 """
 
 import os
-from typing import Dict, Any
+import zipfile
+from datetime import datetime
+from typing import Dict, Any, List, Optional
 import docx
+from lxml import etree
 
 from .base import BaseProcessor
 
+# WordprocessingML and core properties namespaces
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+CORE_PROPERTY_TAGS = {
+    "{http://purl.org/dc/elements/1.1/}title": "title",
+    "{http://purl.org/dc/elements/1.1/}creator": "author",
+    "{http://purl.org/dc/terms/}created": "created",
+    "{http://purl.org/dc/terms/}modified": "modified",
+    "{http://schemas.openxmlformats.org/package/2006/metadata/core-properties}lastModifiedBy": "last_modified_by",
+    "{http://schemas.openxmlformats.org/package/2006/metadata/core-properties}category": "category",
+    "{http://purl.org/dc/elements/1.1/}description": "comments",
+    "{http://schemas.openxmlformats.org/package/2006/metadata/core-properties}keywords": "keywords",
+}
+
 
 class DocxProcessor(BaseProcessor):
     """Processor for Microsoft Word (DOCX) documents."""
+    
+    def __init__(self, file_path: str):
+        """
+        Initialize the processor with a file path.
 
-    def extract_text(self) -> str:
+        Args:
+            file_path: Path to the document file
+        """
+        super().__init__(file_path)
+        self._paragraph_count: Optional[int] = None
+        self._table_count: Optional[int] = None
+    
+    def _extract_text(self) -> str:
         """
         Extract text content from a DOCX file.
 
+        The document part is streamed with lxml's iterparse and each
+        paragraph is discarded once its text is read, so large documents
+        never exist as a full element or python-docx object tree. Body
+        paragraphs and table cells are returned in document order.
+
+        Returns:
+            str: The extracted text
+        """
+        try:
+            with zipfile.ZipFile(self.file_path) as package:
+                with package.open("word/document.xml") as part:
+                    return self._stream_text(part)
+        except KeyError:
+            # Document part stored under a non-standard name
+            return self._extract_text_with_python_docx()
+    
+    def _stream_text(self, part) -> str:
+        """
+        Collect paragraph and table cell text from a streamed document part.
+
+        Args:
+            part: File object with the WordprocessingML document part
+
+        Returns:
+            str: The extracted text
+        """
+        full_text: List[str] = []
+        cell_text: List[str] = []
+        paragraph_count = 0
+        table_count = 0
+        table_depth = 0
+        
+        events = etree.iterparse(
+            part, events=("start", "end"), tag=(W + "p", W + "tbl", W + "tc")
+        )
+        for event, elem in events:
+            if elem.tag == W + "tbl":
+                if event == "start":
+                    if table_depth == 0:
+                        table_count += 1
+                    table_depth += 1
+                    continue
+                table_depth -= 1
+            elif event == "start":
+                continue
+            elif elem.tag == W + "p":
+                text = _paragraph_text(elem)
+                if table_depth:
+                    cell_text.append(text)
+                else:
+                    paragraph_count += 1
+                    if text:
+                        full_text.append(text)
+            elif table_depth == 1:
+                # End of a top-level table cell
+                text = "\n".join(cell_text)
+                if text:
+                    full_text.append(text)
+                cell_text = []
+            
+            # Drop what has been read to keep memory flat
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+        
+        self._paragraph_count = paragraph_count
+        self._table_count = table_count
+        return "\n".join(full_text)
+    
+    def _extract_text_with_python_docx(self) -> str:
+        """
+        Extract text and counts through python-docx's object model.
+
         Returns:
             str: The extracted text
         """
@@ -26,7 +126,7 @@ class DocxProcessor(BaseProcessor):
         for para in doc.paragraphs:
             if para.text:
                 full_text.append(para.text)
-                
+        
         # Extract text from tables
         for table in doc.tables:
             for row in table.rows:
@@ -34,12 +134,17 @@ class DocxProcessor(BaseProcessor):
                     if cell.text:
                         full_text.append(cell.text)
         
+        self._paragraph_count = len(doc.paragraphs)
+        self._table_count = len(doc.tables)
         return "\n".join(full_text)
-
-    def extract_metadata(self) -> Dict[str, Any]:
+    
+    def _extract_metadata(self) -> Dict[str, Any]:
         """
         Extract metadata from a DOCX file.
 
+        Core properties are read from the small docProps/core.xml part, and
+        the counts come from the same pass that extracts the text.
+
         Returns:
             dict: DOCX metadata including title, author, etc.
         """
@@ -48,43 +153,66 @@ class DocxProcessor(BaseProcessor):
             "filename": os.path.basename(self.file_path),
             "file_type": "docx",
         }
-
-        doc = docx.Document(self.file_path)
         
         # Extract core properties if available
-        if hasattr(doc, "core_properties"):
-            props = doc.core_properties
-            
-            if hasattr(props, "title") and props.title:
-                metadata["title"] = props.title
-                
-            if hasattr(props, "author") and props.author:
-                metadata["author"] = props.author
-                
-            if hasattr(props, "created") and props.created:
-                metadata["created"] = props.created
-                
-            if hasattr(props, "modified") and props.modified:
-                metadata["modified"] = props.modified
-                
-            if hasattr(props, "last_modified_by") and props.last_modified_by:
-                metadata["last_modified_by"] = props.last_modified_by
-                
-            if hasattr(props, "category") and props.category:
-                metadata["category"] = props.category
-                
-            if hasattr(props, "comments") and props.comments:
-                metadata["comments"] = props.comments
-                
-            if hasattr(props, "keywords") and props.keywords:
-                metadata["keywords"] = props.keywords
-        
-        # Count paragraphs, tables, and approximate word count
-        metadata["paragraph_count"] = len(doc.paragraphs)
-        metadata["table_count"] = len(doc.tables)
+        metadata.update(self._core_properties())
         
         # Get approximate word count
         text = self.extract_text()
         metadata["word_count"] = len(text.split())
+        
+        # Count paragraphs and tables
+        metadata["paragraph_count"] = self._paragraph_count
+        metadata["table_count"] = self._table_count
+        
+        return metadata
+    
+    def _core_properties(self) -> Dict[str, Any]:
+        """
+        Read the non-empty core properties of the document.
+
+        Returns:
+            dict: Core properties under python-docx's property names
+        """
+        try:
+            with zipfile.ZipFile(self.file_path) as package:
+                root = etree.fromstring(package.read("docProps/core.xml"))
+        except KeyError:
+            return {}
+        
+        properties: Dict[str, Any] = {}
+        for elem in root:
+            name = CORE_PROPERTY_TAGS.get(elem.tag)
+            value = (elem.text or "").strip()
+            if not name or not value:
+                continue
+            
+            if name in ("created", "modified"):
+                try:
+                    properties[name] = datetime.fromisoformat(value.replace("Z", "+00:00"))
+                except ValueError:
+                    continue
+            else:
+                properties[name] = value
+        
+        return properties
+
+
+def _paragraph_text(paragraph) -> str:
+    """
+    Return the text of a paragraph element the way python-docx renders it.
+
+    Args:
+        paragraph: A w:p element
 
-        return metadata 
\ No newline at end of file
+    Returns:
+        str: Run text, with tabs and line breaks
+    """
+    pieces = []
+    for node in paragraph.iter(W + "t", W + "tab", W + "br", W + "cr"):
+        if node.tag == W + "t":
+            pieces.append(node.text or "")
+        elif node.getparent().tag == W + "r":
+            # Tabs and breaks in runs; w:tab also appears in tab stop definitions
+            pieces.append("\t" if node.tag == W + "tab" else "\n")
+    return "".join(pieces)
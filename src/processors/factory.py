@@ -2,15 +2,78 @@
 Factory for creating document processors based on file type.
 """
 
+import importlib
 import os
-from typing import Optional
+from typing import Dict, Optional, Tuple, Type
 
 from .base import BaseProcessor
-from .pdf import PDFProcessor
-from .markdown import MarkdownProcessor
-from .html import HTMLProcessor
-from .text import TextProcessor
-from .docx import DocxProcessor
+
+
+# Map extensions to processor modules and classes. The modules are imported
+# on first use, so pdfminer, python-docx, lxml and PyYAML are only loaded
+# for the formats actually ingested.
+_PROCESSORS: Dict[str, Tuple[str, str]] = {
+    "pdf": (".pdf", "PDFProcessor"),
+    "md": (".markdown", "MarkdownProcessor"),
+    "markdown": (".markdown", "MarkdownProcessor"),
+    "html": (".html", "HTMLProcessor"),
+    "htm": (".html", "HTMLProcessor"),
+    "txt": (".text", "TextProcessor"),
+    "text": (".text", "TextProcessor"),
+    "docx": (".docx", "DocxProcessor"),
+}
+
+# Processor classes already imported, by extension
+_loaded: Dict[str, Type[BaseProcessor]] = {}
+
+
+def _processor_class(ext: str) -> Optional[Type[BaseProcessor]]:
+    """
+    Return the processor class for an extension, importing its module the first time.
+
+    Args:
+        ext: Lowercase file extension without the dot
+
+    Returns:
+        The processor class, or None if the extension is unsupported
+    """
+    processor_class = _loaded.get(ext)
+    if processor_class is None and ext in _PROCESSORS:
+        module_name, class_name = _PROCESSORS[ext]
+        module = importlib.import_module(module_name, __package__)
+        processor_class = _loaded[ext] = getattr(module, class_name)
+    return processor_class
+
+
+def _extension(file_path: str) -> str:
+    """
+    Return the lowercase extension of a file name, without the dot.
+
+    Args:
+        file_path: Path to the document file
+
+    Returns:
+        The extension, lowercasing only the extension itself, or "" if there is none
+    """
+    name = os.path.basename(file_path)
+    dot = name.rfind(".")
+    return name[dot + 1:].lower() if dot > 0 else ""
+
+
+def is_supported(file_path: str) -> bool:
+    """
+    Check whether a file has a processor, from its name alone.
+
+    Neither the file nor a processor module is touched, so unsupported
+    files can be turned away before any other work.
+
+    Args:
+        file_path: Path or name of the document file
+
+    Returns:
+        True if get_processor would return a processor for the file
+    """
+    return _extension(file_path) in _PROCESSORS
 
 
 def get_processor(file_path: str) -> Optional[BaseProcessor]:
@@ -23,24 +86,8 @@ def get_processor(file_path: str) -> Optional[BaseProcessor]:
     Returns:
         BaseProcessor: The appropriate processor instance or None if unsupported
     """
-    # Get the file extension
-    _, ext = os.path.splitext(file_path.lower())
-    ext = ext[1:] if ext else ""
-    
-    # Map extensions to processor classes
-    processors = {
-        "pdf": PDFProcessor,
-        "md": MarkdownProcessor,
-        "markdown": MarkdownProcessor,
-        "html": HTMLProcessor,
-        "htm": HTMLProcessor,
-        "txt": TextProcessor,
-        "text": TextProcessor,
-        "docx": DocxProcessor,
-    }
-    
     # Get the processor class for the extension
-    processor_class = processors.get(ext)
+    processor_class = _processor_class(_extension(file_path))
     
     if processor_class:
         return processor_class(file_path)
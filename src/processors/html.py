@@ -3,42 +3,71 @@ HTML document processor.
 """
 
 import os
-from typing import Dict, Any
-from bs4 import BeautifulSoup
+import re
+from typing import Dict, Any, Optional
+import lxml.html
+from lxml import etree
 
 from .base import BaseProcessor
 
+# Uploads are decoded as UTF-8 by the parser itself, without a Python-level
+# read or decode of the whole page first
+_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+# Any run of whitespace, collapsed to a single space in extracted text
+_WS_RE = re.compile(r"\s+")
+
 
 class HTMLProcessor(BaseProcessor):
     """Processor for HTML documents."""
 
-    def extract_text(self) -> str:
+    def __init__(self, file_path: str):
+        """
+        Initialize the processor with a file path.
+
+        Args:
+            file_path: Path to the document file
+        """
+        super().__init__(file_path)
+        self._tree: Optional[lxml.html.HtmlElement] = None
+        self._parsed = False
+
+    def _document(self) -> Optional[lxml.html.HtmlElement]:
+        """
+        Read and parse the file, only on the first call.
+
+        Returns:
+            The parsed document shared by text and metadata extraction, or
+            None if the file is empty
+        """
+        if not self._parsed:
+            # lxml's C parser is far faster than BeautifulSoup with html.parser,
+            # and reads the file itself, so the page never exists as one
+            # Python bytes object. Its root is None for an empty document.
+            self._tree = lxml.html.parse(self.file_path, parser=_PARSER).getroot()
+            self._parsed = True
+        
+        return self._tree
+
+    def _extract_text(self) -> str:
         """
         Extract text content from an HTML file.
 
         Returns:
             str: The extracted text
         """
-        with open(self.file_path, "r", encoding="utf-8") as file:
-            html_content = file.read()
-            
-            soup = BeautifulSoup(html_content, "html.parser")
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.extract()
-                
-            # Get text
-            text = soup.get_text(separator=" ", strip=True)
-            
-            # Remove excessive whitespace
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = " ".join(chunk for chunk in chunks if chunk)
+        tree = self._document()
+        if tree is None:
+            return ""
+        
+        # Remove script and style elements in one C-level pass, keeping the
+        # text that follows them
+        etree.strip_elements(tree, "script", "style", with_tail=False)
             
-            return text
+        # Get text, with runs of whitespace collapsed in one pass
+        return _WS_RE.sub(" ", " ".join(tree.itertext())).strip()
 
-    def extract_metadata(self) -> Dict[str, Any]:
+    def _extract_metadata(self) -> Dict[str, Any]:
         """
         Extract metadata from an HTML file.
 
@@ -51,17 +80,15 @@ class HTMLProcessor(BaseProcessor):
             "file_type": "html",
         }
 
-        with open(self.file_path, "r", encoding="utf-8") as file:
-            html_content = file.read()
-            soup = BeautifulSoup(html_content, "html.parser")
-            
+        tree = self._document()
+        if tree is not None:
             # Extract title
-            title_tag = soup.find("title")
-            if title_tag:
-                metadata["title"] = title_tag.get_text(strip=True)
+            title_tag = tree.find(".//title")
+            if title_tag is not None:
+                metadata["title"] = title_tag.text_content().strip()
                 
             # Extract meta tags
-            for meta in soup.find_all("meta"):
+            for meta in tree.iter("meta"):
                 name = meta.get("name", "").lower()
                 content = meta.get("content", "")
                 
@@ -79,12 +106,12 @@ class HTMLProcessor(BaseProcessor):
             
             # Extract first h1 if no title found
             if "title" not in metadata:
-                h1 = soup.find("h1")
-                if h1:
-                    metadata["title"] = h1.get_text(strip=True)
-            
-            # Get approximate word count
-            text_content = self.extract_text()
-            metadata["word_count"] = len(text_content.split())
+                h1 = tree.find(".//h1")
+                if h1 is not None:
+                    metadata["title"] = h1.text_content().strip()
+        
+        # Get approximate word count from the same parse
+        text_content = self.extract_text()
+        metadata["word_count"] = len(text_content.split())
 
         return metadata 
\ No newline at end of file
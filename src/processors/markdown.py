@@ -2,38 +2,101 @@
 Markdown document processor.
 """
 
+import html
 import os
 import re
-from typing import Dict, Any
-import markdown
-from bs4 import BeautifulSoup
+from datetime import date
+from typing import Dict, Any, Optional
+import yaml
 
 from .base import BaseProcessor
 
+# YAML frontmatter between --- markers at the start of the file
+_FM_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+
+# libyaml's C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Markdown syntax stripped by _strip_md, applied in order. Each pattern keeps
+# the visible text (link text, image alt text, code, emphasised words) and
+# drops only the markup around it. A pattern only runs when one of its
+# trigger substrings is in the text, since a scan that can't match still
+# costs a pass over the whole document.
+_MD_PATTERNS = [
+    (re.compile(r"^[ \t]*(```|~~~).*$", re.MULTILINE), "", ("```", "~~~")),         # Code fence lines
+    (re.compile(r"!?\[([^\]]*)\]\([^)]*\)"), r"\1", ("](",)),                       # Images and inline links
+    (re.compile(r"\[([^\]]+)\]\[[^\]]*\]"), r"\1", ("][",)),                        # Reference links
+    (re.compile(r"^[ \t]*\[[^\]]+\]:.*$", re.MULTILINE), "", ("]:",)),              # Link reference definitions
+    (re.compile(r"`+([^`]*)`+"), r"\1", ("`",)),                                      # Inline code
+    (re.compile(r"<[^>\n]+>"), "", ("<",)),                                          # HTML tags
+    (re.compile(r"^[ \t]{0,3}#{1,6}[ \t]*|[ \t]+#+[ \t]*$", re.MULTILINE), "", ("#",)),  # ATX headings
+    (re.compile(r"^[ \t]*([-*_][ \t]*){3,}$", re.MULTILINE), "", ("-", "*", "_")),   # Horizontal rules
+    (re.compile(r"^[ \t]*(>[ \t]?)+", re.MULTILINE), "", (">",)),                     # Blockquotes
+    (re.compile(r"^[ \t]*([-*+]|\d+[.)])[ \t]+", re.MULTILINE), "", ()),            # List markers
+    (re.compile(r"(\*{1,3})(?=\S)(.+?)(?<=\S)\1"), r"\2", ("*",)),                     # *Emphasis*
+    (re.compile(r"(?<!\w)(_{1,3})(?=\S)(.+?)(?<=\S)\1(?!\w)"), r"\2", ("_",)),         # _Emphasis_
+    (re.compile(r"~~(.+?)~~"), r"\1", ("~~",)),                                         # Strikethrough
+]
+
+# Any run of whitespace, collapsed to a single space in extracted text
+_WS_RE = re.compile(r"\s+")
+
 
 class MarkdownProcessor(BaseProcessor):
     """Processor for Markdown documents."""
+    
+    def __init__(self, file_path: str, strict: bool = False):
+        """
+        Initialize the processor with a file path.
+
+        Args:
+            file_path: Path to the document file
+            strict: Render the Markdown to HTML to extract text, instead of
+                stripping the syntax with regular expressions
+        """
+        super().__init__(file_path)
+        self.strict = strict
+        self._content: Optional[str] = None
+    
+    def _read(self) -> str:
+        """
+        Read the file, only on the first call.
 
-    def extract_text(self) -> str:
+        Returns:
+            str: The Markdown source
+        """
+        if self._content is None:
+            self._content = self._read_text()
+        return self._content
+    
+    def _extract_text(self) -> str:
         """
         Extract text content from a Markdown file.
 
         Returns:
             str: The extracted text
         """
-        with open(self.file_path, "r", encoding="utf-8") as file:
-            md_content = file.read()
-            
-            # Convert markdown to HTML
-            html = markdown.markdown(md_content)
-            
-            # Extract text from HTML
-            soup = BeautifulSoup(html, "html.parser")
-            text = soup.get_text(separator=" ", strip=True)
-            
-            return text
-
-    def extract_metadata(self) -> Dict[str, Any]:
+        md_content = self._read()
+        
+        if not self.strict:
+            return _strip_md(md_content)
+        
+        # The HTML round trip is rarely used, so its libraries are only
+        # imported for it
+        import markdown
+        import lxml.html
+        
+        # Convert markdown to HTML
+        html_content = markdown.markdown(md_content)
+        if not html_content.strip():
+            return ""
+        
+        # Extract text from HTML with lxml's C parser, joining the stripped
+        # text pieces with spaces
+        root = lxml.html.fragment_fromstring(html_content, create_parent="div")
+        return " ".join(piece for piece in map(str.strip, root.itertext()) if piece)
+    
+    def _extract_metadata(self) -> Dict[str, Any]:
         """
         Extract metadata from a Markdown file.
         Looks for YAML frontmatter if present.
@@ -46,23 +109,64 @@ class MarkdownProcessor(BaseProcessor):
             "filename": os.path.basename(self.file_path),
             "file_type": "markdown",
         }
+        
+        content = self._read()
+        
+        # Check for YAML frontmatter (between --- markers)
+        frontmatter_match = _FM_RE.match(content)
+        if frontmatter_match:
+            try:
+                frontmatter = yaml.load(frontmatter_match.group(1), Loader=_YAML_LOADER)
+            except yaml.YAMLError:
+                # Not valid YAML; index the document without it
+                frontmatter = None
+            
+            # Extract key-value pairs from frontmatter
+            if isinstance(frontmatter, dict):
+                metadata.update({str(key).lower(): _plain_value(value) for key, value in frontmatter.items()})
+        
+        # Get approximate word count
+        text_content = self.extract_text()
+        metadata["word_count"] = len(text_content.split())
+        
+        return metadata
+
+
+def _strip_md(content: str) -> str:
+    """
+    Strip Markdown syntax from a document, keeping its text.
+
+    Much faster than rendering to HTML and parsing that, and close enough
+    for embedding and word counts. Frontmatter is left out of the text.
+
+    Args:
+        content: Markdown source
+
+    Returns:
+        str: The text, with whitespace collapsed
+    """
+    frontmatter_match = _FM_RE.match(content)
+    text = content[frontmatter_match.end():] if frontmatter_match else content
+    for pattern, replacement, triggers in _MD_PATTERNS:
+        if not triggers or any(trigger in text for trigger in triggers):
+            text = pattern.sub(replacement, text)
+    return _WS_RE.sub(" ", html.unescape(text)).strip()
+
+
+def _plain_value(value: Any) -> Any:
+    """
+    Turn YAML dates into ISO strings so frontmatter stays JSON-serializable.
+
+    Args:
+        value: A value loaded from YAML
 
-        with open(self.file_path, "r", encoding="utf-8") as file:
-            content = file.read()
-
-            # Check for YAML frontmatter (between --- markers)
-            frontmatter_match = re.search(r"^---\s*\n(.*?)\n---\s*\n", content, re.DOTALL)
-            if frontmatter_match:
-                frontmatter_text = frontmatter_match.group(1)
-                
-                # Extract key-value pairs from frontmatter
-                for line in frontmatter_text.split("\n"):
-                    if ":" in line:
-                        key, value = line.split(":", 1)
-                        metadata[key.strip().lower()] = value.strip()
-
-            # Get approximate word count
-            text_content = self.extract_text()
-            metadata["word_count"] = len(text_content.split())
-
-        return metadata 
\ No newline at end of file
+    Returns:
+        The value, with dates and datetimes as ISO 8601 strings
+    """
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, list):
+        return [_plain_value(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _plain_value(item) for key, item in value.items()}
+    return value
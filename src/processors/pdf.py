@@ -15,7 +15,7 @@ from .base import BaseProcessor
 class PDFProcessor(BaseProcessor):
     """Processor for PDF documents."""
 
-    def extract_text(self) -> str:
+    def _extract_text(self) -> str:
         """
         Extract text content from a PDF file.
 
@@ -25,7 +25,7 @@ class PDFProcessor(BaseProcessor):
         text = pdfminer.high_level.extract_text(self.file_path)
         return text
 
-    def extract_metadata(self) -> Dict[str, Any]:
+    def _extract_metadata(self) -> Dict[str, Any]:
         """
         Extract metadata from a PDF file.
 
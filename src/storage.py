@@ -2,8 +2,13 @@
 Vector database storage utilities.
 """
 
-from typing import List, Dict, Any, Optional
-import uuid
+import asyncio
+import hashlib
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Union
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as rest
 from qdrant_client.http.exceptions import UnexpectedResponse
@@ -14,9 +19,57 @@ from .config import settings
 
 logger = logging.getLogger(__name__)
 
+# gRPC channel options: no message size ceiling for large upserts, and
+# keepalive pings so idle connections aren't silently dropped
+GRPC_OPTIONS = {
+    "grpc.max_send_message_length": 512 * 1024 * 1024,
+    "grpc.max_receive_message_length": 512 * 1024 * 1024,
+    "grpc.keepalive_time_ms": 30000,
+}
+
+# Point IDs are kept to 63 bits so they also fit signed 64-bit integers
+_MAX_POINT_ID = (1 << 63) - 1
+
+# Clients shared by all QdrantStorage instances of a process, keyed by
+# (host, port, api_key, prefer_grpc), so each server gets one connection pool
+_clients: Dict[tuple, QdrantClient] = {}
+_clients_lock = threading.Lock()
+
+# Payload keys of metadata fields, built once per field name. Filter keys
+# come from requests, so the cache stops growing at _METADATA_KEYS_MAX.
+_metadata_keys: Dict[str, str] = {}
+_METADATA_KEYS_MAX = 1024
+
+# Metadata fields with a payload index, and the index type of each
+INDEX_FIELDS = [
+    ("filename", rest.PayloadSchemaType.KEYWORD),
+    ("file_type", rest.PayloadSchemaType.KEYWORD),
+    ("title", rest.PayloadSchemaType.TEXT),
+    ("author", rest.PayloadSchemaType.KEYWORD),
+    ("chunk_id", rest.PayloadSchemaType.INTEGER),
+    ("location", rest.PayloadSchemaType.KEYWORD),
+    ("size_kb", rest.PayloadSchemaType.FLOAT),
+]
+INDEXED_FIELDS = frozenset(field_name for field_name, _ in INDEX_FIELDS)
+
+# Unindexed filter fields already warned about. Field names come from
+# requests, so the set stops growing (and warnings stop) at _WARNED_FIELDS_MAX.
+_warned_fields = set()
+_WARNED_FIELDS_MAX = 1024
+
+# (host, port, collection) of collections already checked or created by this
+# process, so further QdrantStorage instances skip the round trip
+_checked_collections = set()
+
 
 class QdrantStorage:
-    """Interface for storing vectors in Qdrant database."""
+    """
+    Interface for storing vectors in Qdrant database.
+
+    The client talks gRPC by default (QDRANT_PREFER_GRPC), which has less
+    per-request overhead than REST and no HTTP body size limit, with the
+    channel options in GRPC_OPTIONS and a QDRANT_TIMEOUT request timeout.
+    """
 
     def __init__(
         self,
@@ -27,6 +80,9 @@ class QdrantStorage:
         prefer_grpc: bool = None,
         api_key: str = None,
         auto_create_collection: bool = True,
+        quantization: bool = None,
+        hnsw: Optional[Dict[str, Any]] = None,
+        upsert_batch_size: Optional[int] = None,
     ):
         """
         Initialize Qdrant storage client.
@@ -39,6 +95,11 @@ class QdrantStorage:
             prefer_grpc: Whether to prefer gRPC over HTTP
             api_key: API key for Qdrant Cloud
             auto_create_collection: Whether to automatically create the collection if it doesn't exist
+            quantization: Whether a newly created collection uses int8 scalar quantization
+            hnsw: HNSW parameters for a newly created collection, overriding
+                the defaults from settings (see rest.HnswConfigDiff)
+            upsert_batch_size: Points per upsert when storing chunks
+                (default QDRANT_UPSERT_BATCH_SIZE)
         """
         # Use settings if not provided
         self.host = host or settings.qdrant.host
@@ -47,44 +108,110 @@ class QdrantStorage:
         self.prefer_grpc = prefer_grpc if prefer_grpc is not None else settings.qdrant.prefer_grpc
         self.api_key = api_key or settings.qdrant.api_key
         self.vector_size = vector_size or settings.embedding.dimensions
+        self.quantization = quantization if quantization is not None else settings.qdrant.quantization
+        self.vector_datatype = settings.qdrant.vector_datatype
+        self.hnsw = {
+            "m": settings.qdrant.hnsw_m,
+            "ef_construct": settings.qdrant.hnsw_ef_construct,
+            "payload_m": 128,
+            # 0 lets the server use its own CPU count
+            "max_indexing_threads": 0,
+            "on_disk": True,
+            **(hnsw or {}),
+        }
+        self.upsert_batch_size = upsert_batch_size or settings.qdrant.upsert_batch_size
+        self.upsert_concurrency = settings.qdrant.upsert_concurrency
+        
+        # Threads that send the batches of a large store concurrently
+        self._upsert_executor = ThreadPoolExecutor(
+            max_workers=self.upsert_concurrency,
+            thread_name_prefix="qdrant-upsert"
+        )
         
-        # Initialize Qdrant client
+        # Reuse the process's client for this server, creating it if needed
+        key = (self.host, self.port, self.api_key, self.prefer_grpc)
+        with _clients_lock:
+            self.client = _clients.get(key)
+            if self.client is None:
+                self.client = _clients[key] = self._create_client()
+        
+        # Auto-create collection if needed
+        if auto_create_collection:
+            self._ensure_collection_exists()
+
+    def _create_client(self) -> QdrantClient:
+        """
+        Create a client for this instance's server.
+
+        Returns:
+            QdrantClient: New client with a QDRANT_POOL_SIZE connection pool
+        """
         if self.api_key:
             # Using Qdrant Cloud
-            self.client = QdrantClient(
+            return QdrantClient(
                 url=self.host,
                 api_key=self.api_key,
-                prefer_grpc=self.prefer_grpc
-            )
-        else:
-            # Using local or custom Qdrant instance
-            self.client = QdrantClient(
-                host=self.host,
-                port=self.port,
-                prefer_grpc=self.prefer_grpc
+                prefer_grpc=self.prefer_grpc,
+                grpc_options=GRPC_OPTIONS,
+                timeout=settings.qdrant.timeout,
+                pool_size=settings.qdrant.pool_size
             )
         
-        # Auto-create collection if needed
-        if auto_create_collection:
-            self._ensure_collection_exists()
+        # Using local or custom Qdrant instance
+        return QdrantClient(
+            host=self.host,
+            port=self.port,
+            prefer_grpc=self.prefer_grpc,
+            grpc_options=GRPC_OPTIONS,
+            timeout=settings.qdrant.timeout,
+            pool_size=settings.qdrant.pool_size
+        )
 
     def _ensure_collection_exists(self) -> None:
         """
         Ensure that the collection exists, creating it if necessary.
+
+        Only the first instance per host, port and collection in a process
+        asks the server.
         """
+        key = (self.host, self.port, self.collection_name)
+        if key in _checked_collections:
+            return
+        
         try:
-            collections = self.client.get_collections().collections
-            collection_names = [collection.name for collection in collections]
-            
-            if self.collection_name not in collection_names:
+            if not self.client.collection_exists(self.collection_name):
                 logger.info(f"Creating Qdrant collection '{self.collection_name}'")
                 
-                # Create the collection
+                # Create the collection. With quantization, searches traverse
+                # int8 vectors kept in RAM (a quarter of the size) and the
+                # full vectors stay on disk for rescoring. The server stores
+                # those in QDRANT_VECTOR_DATATYPE; float16 halves their size
+                # and the disk reads of rescoring, with no practical loss for
+                # normalized embeddings.
+                quantization_config = None
+                if self.quantization:
+                    quantization_config = rest.ScalarQuantization(
+                        scalar=rest.ScalarQuantizationConfig(
+                            type=rest.ScalarType.INT8,
+                            quantile=0.99,
+                            always_ram=True
+                        )
+                    )
                 self.client.create_collection(
                     collection_name=self.collection_name,
                     vectors_config=rest.VectorParams(
                         size=self.vector_size,
-                        distance=rest.Distance.COSINE
+                        distance=rest.Distance.COSINE,
+                        on_disk=self.quantization,
+                        datatype=rest.Datatype(self.vector_datatype)
+                    ),
+                    quantization_config=quantization_config,
+                    hnsw_config=rest.HnswConfigDiff(**self.hnsw),
+                    # Build the index and memory-map segments once they
+                    # pass 20k points, rather than for every small segment
+                    optimizers_config=rest.OptimizersConfigDiff(
+                        indexing_threshold=20000,
+                        memmap_threshold=20000
                     )
                 )
                 
@@ -95,156 +222,339 @@ class QdrantStorage:
         except Exception as e:
             logger.error(f"Error checking/creating collection: {str(e)}")
             raise
+        
+        _checked_collections.add(key)
 
     def _create_payload_indexes(self) -> None:
         """
         Create payload indexes for faster filtering.
+
+        The indexes are requested concurrently, so creating them takes about
+        one round trip instead of one per field.
         """
-        # List of fields to index
-        index_fields = [
-            ("filename", "keyword"),
-            ("file_type", "keyword"),
-            ("title", "text"),
-            ("author", "keyword"),
-            ("chunk_id", "integer"),
-            ("location", "keyword"),
-        ]
-        
-        for field_name, field_type in index_fields:
-            try:
-                field_schema = None
-                
-                # Define the schema based on field type
-                if field_type == "keyword":
-                    field_schema = rest.PayloadSchemaType.KEYWORD
-                elif field_type == "integer":
-                    field_schema = rest.PayloadSchemaType.INTEGER
-                elif field_type == "text":
-                    field_schema = rest.PayloadSchemaType.TEXT
-                
-                if field_schema:
-                    # Create the index
-                    self.client.create_payload_index(
-                        collection_name=self.collection_name,
-                        field_name=f"metadata.{field_name}",
-                        field_schema=field_schema
-                    )
-            except UnexpectedResponse:
-                # Index might already exist, which is fine
-                pass
-            except Exception as e:
-                logger.warning(f"Failed to create index for {field_name}: {str(e)}")
+        with ThreadPoolExecutor(max_workers=len(INDEX_FIELDS)) as executor:
+            list(executor.map(lambda field: self._create_payload_index(*field), INDEX_FIELDS))
+
+    def _create_payload_index(self, field_name: str, field_schema: rest.PayloadSchemaType) -> None:
+        """
+        Create one payload index, logging rather than raising on failure.
+
+        Args:
+            field_name: Metadata field to index
+            field_schema: Index type
+        """
+        try:
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name=_metadata_key(field_name),
+                field_schema=field_schema
+            )
+        except UnexpectedResponse:
+            # Index might already exist, which is fine
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to create index for {field_name}: {str(e)}")
 
-    def store_chunks(self, chunks: List[Dict[str, Any]]) -> List[str]:
+    def store_chunks(self, chunks: List[Dict[str, Any]], embeddings: np.ndarray) -> List[str]:
         """
         Store document chunks in Qdrant.
 
+        The points are sent in batches of QDRANT_UPSERT_BATCH_SIZE, with up
+        to QDRANT_UPSERT_CONCURRENCY requests in flight, so a large document
+        neither goes out as one oversized request nor waits for each batch
+        to be indexed before sending the next.
+
+        Upserts return once Qdrant has accepted them into its write-ahead
+        log, before they are applied. Call flush() before querying for the
+        stored chunks.
+
         Args:
-            chunks: List of chunks with text, metadata, and embeddings
+            chunks: List of chunks with text and metadata
+            embeddings: Array of embeddings, one row per chunk
 
         Returns:
-            List of IDs assigned to the stored chunks
+            List of IDs assigned to the stored chunks, as strings
         """
         if not chunks:
             return []
         
-        # Prepare points for Qdrant
-        points = []
-        ids = []
+        # Derive an ID for each chunk from its content
+        ids = _point_ids(chunks)
+        
+        # Normalise half-precision model output (float16) to float32
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        
+        size = self.upsert_batch_size
+        if len(ids) <= size:
+            self._upsert(chunks, ids, embeddings)
+            return [str(point_id) for point_id in ids]
+        
+        # Each batch is built only when it is sent, and at most
+        # QDRANT_UPSERT_CONCURRENCY of them exist at a time
+        in_flight = deque()
+        for i in range(0, len(ids), size):
+            if len(in_flight) >= self.upsert_concurrency:
+                in_flight.popleft().result()
+            in_flight.append(self._upsert_executor.submit(
+                self._upsert, chunks[i:i + size], ids[i:i + size], embeddings[i:i + size]
+            ))
+        # Wait for the rest so a failed batch raises here
+        for future in in_flight:
+            future.result()
+        
+        return [str(point_id) for point_id in ids]
+    
+    async def aupsert_batches(
+        self,
+        chunks: List[Dict[str, Any]],
+        embeddings: np.ndarray,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ) -> List[str]:
+        """
+        Store document chunks from the event loop, with concurrent batched upserts.
+
+        Like store_chunks, but each batch is sent from a worker thread while
+        the caller's event loop keeps running, with at most ``concurrency``
+        batches in flight.
+
+        Args:
+            chunks: List of chunks with text and metadata
+            embeddings: Array of embeddings, one row per chunk
+            batch_size: Points per upsert (default QDRANT_UPSERT_BATCH_SIZE)
+            concurrency: Upserts in flight at once (default QDRANT_UPSERT_CONCURRENCY)
+
+        Returns:
+            List of IDs assigned to the stored chunks, as strings
+        """
+        if not chunks:
+            return []
         
-        for chunk in chunks:
-            # Generate a unique ID for the chunk
-            chunk_id = str(uuid.uuid4())
-            ids.append(chunk_id)
-            
-            # Create a Qdrant point
-            points.append(
-                rest.PointStruct(
-                    id=chunk_id,
-                    vector=chunk["embedding"],
-                    payload={
-                        "text": chunk["text"],
-                        "metadata": chunk["metadata"]
-                    }
+        ids = _point_ids(chunks)
+        # Normalise half-precision model output (float16) to float32
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        size = batch_size or self.upsert_batch_size
+        semaphore = asyncio.Semaphore(concurrency or self.upsert_concurrency)
+        
+        async def upsert(start: int):
+            async with semaphore:
+                await asyncio.to_thread(
+                    self._upsert, chunks[start:start + size], ids[start:start + size], embeddings[start:start + size]
                 )
-            )
         
-        # Upsert points to Qdrant
+        await asyncio.gather(*(upsert(start) for start in range(0, len(ids), size)))
+        return [str(point_id) for point_id in ids]
+    
+    def _upsert(self, chunks: List[Dict[str, Any]], ids: List[int], embeddings: np.ndarray) -> None:
+        """
+        Send one batch of points to Qdrant.
+
+        The points go as one column-wise batch. rest.Batch still converts
+        the embedding array to nested Python lists when it is validated, and
+        the client serializes those.
+
+        Args:
+            chunks: Chunks with text and metadata
+            ids: ID of each chunk
+            embeddings: Embedding of each chunk
+        """
         self.client.upsert(
             collection_name=self.collection_name,
-            points=points
+            points=rest.Batch(
+                ids=ids,
+                vectors=embeddings,
+                payloads=[{"text": chunk["text"], "metadata": chunk["metadata"]} for chunk in chunks]
+            ),
+            wait=False
         )
-        
-        return ids
+    
+    def flush(self) -> None:
+        """
+        Wait until all upserts sent so far have been applied.
+
+        Qdrant applies a collection's updates in order, so waiting for an
+        empty upsert waits for every earlier one.
+        """
+        self.client.upsert(collection_name=self.collection_name, points=[], wait=True)
+    
+    @staticmethod
+    def _build_filter(filters: Dict[str, Any]) -> rest.Filter:
+        """
+        Build a Qdrant filter matching all of the given metadata values.
+
+        A list or tuple value matches any of its items with a single
+        MatchAny condition; any other value must match exactly.
+
+        Args:
+            filters: Metadata field names and the values to match
+
+        Returns:
+            Filter combining one condition per field with AND
+        """
+        return rest.Filter(must=[
+            rest.FieldCondition(
+                key=_metadata_key(key),
+                match=(
+                    rest.MatchAny(any=list(value))
+                    if isinstance(value, (list, tuple))
+                    else rest.MatchValue(value=value)
+                )
+            )
+            for key, value in filters.items()
+        ])
     
     def search(
         self,
-        query_vector: List[float],
+        query_vector: Union[List[float], np.ndarray],
         limit: int = 10,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        with_payload: bool = True,
+        payload_fields: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for similar vectors in Qdrant.
 
+        Payloads are the bulk of a search response. Callers that only need
+        IDs and scores, or that narrow the hits down further, can search
+        with with_payload=False and load the payloads of the hits they keep
+        with fetch_payloads.
+
         Args:
             query_vector: The query vector to search for
             limit: Maximum number of results to return
             filters: Optional filters to apply to the search
+            with_payload: Whether to return each hit's text and metadata
+            payload_fields: Payload keys to return (e.g. ["metadata"])
+                instead of the whole payload
 
         Returns:
             List of matching documents
         """
         # Prepare filter conditions if any
-        filter_conditions = None
-        if filters:
-            conditions = []
-            for key, value in filters.items():
-                if isinstance(value, (list, tuple)):
-                    # For lists, create a should condition (OR)
-                    or_conditions = [
-                        rest.FieldCondition(
-                            key=f"metadata.{key}",
-                            match=rest.MatchValue(value=v)
-                        )
-                        for v in value
-                    ]
-                    conditions.append(rest.Filter(should=or_conditions))
-                else:
-                    # For single values, create a must condition (AND)
-                    conditions.append(
-                        rest.FieldCondition(
-                            key=f"metadata.{key}",
-                            match=rest.MatchValue(value=value)
-                        )
-                    )
-            
-            # Combine all conditions with AND
-            filter_conditions = rest.Filter(
-                must=conditions
-            )
+        filter_conditions = self._build_filter(filters) if filters else None
         
-        # Execute the search
-        search_results = self.client.search(
+        # Execute the search with the vector as float32, like the stored ones
+        query_vector = np.asarray(query_vector, dtype=np.float32)
+        response = self.client.query_points(
             collection_name=self.collection_name,
-            query_vector=query_vector,
+            query=query_vector.tolist(),
             limit=limit,
             query_filter=filter_conditions,
-            with_payload=True,
+            with_payload=self._payload_selector(with_payload, payload_fields),
             with_vectors=False
         )
         
         # Format the results
-        results = []
-        for hit in search_results:
-            results.append({
-                "id": hit.id,
-                "score": hit.score,
-                "text": hit.payload.get("text", ""),
-                "metadata": hit.payload.get("metadata", {})
-            })
+        return [self._format_hit(hit) for hit in response.points]
+    
+    def search_batch(
+        self,
+        query_vectors: np.ndarray,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        with_payload: bool = True,
+        payload_fields: Optional[List[str]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for several query vectors in one request.
+
+        Args:
+            query_vectors: Query vectors, one row per query
+            limit: Maximum number of results per query
+            filters: Optional filters applied to every query
+            with_payload: Whether to return each hit's text and metadata
+            payload_fields: Payload keys to return instead of the whole payload
+
+        Returns:
+            One list of matching documents per query vector, in order
+        """
+        if len(query_vectors) == 0:
+            return []
+        
+        filter_conditions = self._build_filter(filters) if filters else None
+        query_vectors = np.asarray(query_vectors, dtype=np.float32)
+        payload_selector = self._payload_selector(with_payload, payload_fields)
+        responses = self.client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=[
+                rest.QueryRequest(
+                    query=vector.tolist(),
+                    limit=limit,
+                    filter=filter_conditions,
+                    with_payload=payload_selector,
+                    with_vector=False
+                )
+                for vector in query_vectors
+            ]
+        )
+        
+        return [[self._format_hit(hit) for hit in response.points] for response in responses]
+    
+    def fetch_payloads(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Fill in the text and metadata of search results fetched without payloads.
+
+        Args:
+            results: Results from search(..., with_payload=False)
+
+        Returns:
+            The same results, updated in place, with text and metadata
+        """
+        if not results:
+            return results
+        
+        points = self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=[result["id"] for result in results],
+            with_payload=True,
+            with_vectors=False
+        )
+        payloads = {point.id: point.payload or {} for point in points}
+        for result in results:
+            payload = payloads.get(result["id"], {})
+            result["text"] = payload.get("text", "")
+            result["metadata"] = payload.get("metadata", {})
         
         return results
     
+    @staticmethod
+    def _payload_selector(
+        with_payload: bool,
+        payload_fields: Optional[List[str]]
+    ) -> Union[bool, rest.PayloadSelectorInclude]:
+        """
+        Build the with_payload argument of a query.
+
+        Args:
+            with_payload: Whether to return payloads at all
+            payload_fields: Payload keys to return, or None for all of them
+
+        Returns:
+            The with_payload value for the Qdrant client
+        """
+        if with_payload and payload_fields:
+            return rest.PayloadSelectorInclude(include=payload_fields)
+        return with_payload
+    
+    @staticmethod
+    def _format_hit(hit) -> Dict[str, Any]:
+        """
+        Turn a scored point into a search result.
+
+        Args:
+            hit: Scored point returned by Qdrant
+
+        Returns:
+            dict: The point's id, score, text and metadata
+        """
+        payload = hit.payload or {}
+        return {
+            "id": hit.id,
+            "score": hit.score,
+            "text": payload.get("text", ""),
+            "metadata": payload.get("metadata", {})
+        }
+    
     def delete_by_filters(self, filters: Dict[str, Any]) -> int:
         """
         Delete vectors matching the given filters.
@@ -256,29 +566,8 @@ class QdrantStorage:
             Number of deleted vectors
         """
         # Prepare filter conditions
-        conditions = []
-        for key, value in filters.items():
-            if isinstance(value, (list, tuple)):
-                or_conditions = [
-                    rest.FieldCondition(
-                        key=f"metadata.{key}",
-                        match=rest.MatchValue(value=v)
-                    )
-                    for v in value
-                ]
-                conditions.append(rest.Filter(should=or_conditions))
-            else:
-                conditions.append(
-                    rest.FieldCondition(
-                        key=f"metadata.{key}",
-                        match=rest.MatchValue(value=value)
-                    )
-                )
-        
-        # Combine all conditions with AND
-        filter_conditions = rest.Filter(
-            must=conditions
-        )
+        _warn_unindexed(filters)
+        filter_conditions = self._build_filter(filters)
         
         # Execute the deletion
         result = self.client.delete(
@@ -308,32 +597,81 @@ class QdrantStorage:
             ).count
         
         # Prepare filter conditions
-        conditions = []
-        for key, value in filters.items():
-            if isinstance(value, (list, tuple)):
-                or_conditions = [
-                    rest.FieldCondition(
-                        key=f"metadata.{key}",
-                        match=rest.MatchValue(value=v)
-                    )
-                    for v in value
-                ]
-                conditions.append(rest.Filter(should=or_conditions))
-            else:
-                conditions.append(
-                    rest.FieldCondition(
-                        key=f"metadata.{key}",
-                        match=rest.MatchValue(value=value)
-                    )
-                )
-        
-        # Combine all conditions with AND
-        filter_conditions = rest.Filter(
-            must=conditions
-        )
+        _warn_unindexed(filters)
+        filter_conditions = self._build_filter(filters)
         
         # Execute the count
         return self.client.count(
             collection_name=self.collection_name,
             count_filter=filter_conditions
-        ).count 
\ No newline at end of file
+        ).count
+
+
+def _warn_unindexed(filters: Dict[str, Any]) -> None:
+    """
+    Log a warning, once per field, for filter fields without a payload index.
+
+    Only the first _WARNED_FIELDS_MAX fields are warned about, so requests
+    filtering on ever new names can't grow the set or flood the log.
+
+    Qdrant has to scan every point's payload to evaluate a condition on an
+    unindexed field, which gets slow on large collections.
+
+    Args:
+        filters: Filters about to be sent
+    """
+    for field_name in filters.keys() - INDEXED_FIELDS - _warned_fields:
+        if len(_warned_fields) >= _WARNED_FIELDS_MAX:
+            return
+        _warned_fields.add(field_name)
+        logger.warning(
+            "Filtering on unindexed field %r scans every point; indexed fields are %s",
+            field_name, ", ".join(sorted(INDEXED_FIELDS))
+        )
+
+
+def _metadata_key(field_name: str) -> str:
+    """
+    Return the payload key of a metadata field, e.g. "metadata.filename".
+
+    Filters on the same few fields are built on every search, delete and
+    count, so the keys are created and interned once and reused.
+
+    Args:
+        field_name: Metadata field name
+
+    Returns:
+        str: Key of the field in the point payload
+    """
+    key = _metadata_keys.get(field_name)
+    if key is None:
+        key = f"metadata.{field_name}"
+        if len(_metadata_keys) < _METADATA_KEYS_MAX:
+            key = _metadata_keys[field_name] = sys.intern(key)
+    return key
+
+
+def _point_ids(chunks: List[Dict[str, Any]]) -> List[int]:
+    """
+    Derive a 63-bit integer point ID from each chunk's file name, position and text.
+
+    Integer IDs take 8 bytes where UUID strings take 36, and storing the
+    same chunk again overwrites its point instead of duplicating it. Two
+    different chunks collide with probability of about n^2 / 2^64 for n
+    points in the collection: about 5e-8 at a million points and 5e-4 at
+    a hundred million.
+
+    Args:
+        chunks: Chunks with text and metadata
+
+    Returns:
+        List of point IDs, one per chunk
+    """
+    ids = []
+    for chunk in chunks:
+        metadata = chunk["metadata"]
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(f"{metadata.get('filename', '')}:{metadata.get('chunk_id', '')}:".encode())
+        digest.update(chunk["text"].encode())
+        ids.append(int.from_bytes(digest.digest(), "big") & _MAX_POINT_ID)
+    return ids
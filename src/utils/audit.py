@@ -2,27 +2,77 @@
 Audit logging utilities for the Hermes Ingestor.
 """
 
+import asyncio
 import logging
-import json
 from datetime import datetime
-from typing import Any, Dict, Optional
+import orjson
+from typing import Any, Dict, List, Optional
 from ..config import settings
 
 logger = logging.getLogger("audit")
 
+# Operational messages about the audit logger itself, kept out of the audit trail
+service_logger = logging.getLogger(__name__)
+
 class AuditLogger:
-    """Audit logger for tracking security-relevant events."""
+    """
+    Audit logger for tracking security-relevant events.
+
+    Once started inside an event loop, events are put on a bounded queue and
+    written to the audit log in batches by a background task, so request
+    handlers never wait on file I/O. If the queue is full the event is
+    dropped and counted in ``dropped_events`` instead of blocking.
+    ``log_event`` may also be called from other threads (sync endpoints,
+    worker threads); their events are handed to the event loop thread.
+    """
     
-    def __init__(self):
+    def __init__(self,
+                 max_queue_size: int = 10000,
+                 batch_size: int = 100,
+                 flush_interval: float = 0.1):
         self.logger = logging.getLogger("audit")
         self.logger.setLevel(logging.INFO)
         
         # Add file handler for audit logs
-        handler = logging.FileHandler(settings.audit_log_path)
-        handler.setFormatter(logging.Formatter(
+        self.handler = logging.FileHandler(settings.audit_log_path)
+        self.handler.setFormatter(logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         ))
-        self.logger.addHandler(handler)
+        self.logger.addHandler(self.handler)
+        
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: Optional[asyncio.Queue] = None
+        self.dropped_events = 0
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def start(self):
+        """Start the background writer. Must be called from a running event loop."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = asyncio.create_task(self._drain())
+    
+    async def stop(self):
+        """Stop the background writer and flush any queued events."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        
+        remaining = []
+        while not self.queue.empty():
+            remaining.append(self.queue.get_nowait())
+        self.queue = None
+        if remaining:
+            self._write(remaining)
     
     def log_event(self, 
                   event_type: str,
@@ -38,15 +88,114 @@ class AuditLogger:
             ip_address: IP address of the request
             details: Additional event details
         """
+        # The timestamp is serialized by orjson in the writer, off the request path
         event = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcnow(),
             "event_type": event_type,
             "user_id": user_id,
             "ip_address": ip_address,
             "details": details or {}
         }
         
-        self.logger.info(json.dumps(event))
+        if self.queue is None:
+            # Background writer not running, write synchronously
+            self._write([event])
+            return
+        
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        
+        if running_loop is self._loop:
+            self._enqueue(event)
+            return
+        
+        # asyncio.Queue is not thread-safe; enqueue on the loop's own thread
+        try:
+            self._loop.call_soon_threadsafe(self._enqueue, event)
+        except RuntimeError:
+            # Loop already closed
+            self._write([event])
+    
+    def _enqueue(self, event: Dict[str, Any]):
+        """Put an event on the queue, or count it as dropped if the queue is full."""
+        if self.queue is None:
+            # Stopped after the event was handed over
+            self._write([event])
+            return
+        
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped_events += 1
+    
+    async def _drain(self):
+        """Collect queued events into batches and write them off the event loop."""
+        loop = asyncio.get_running_loop()
+        reported_drops = 0
+        
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.flush_interval
+            
+            # Wait for more events until the batch is full or the interval elapses
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except Exception:
+                # Keep the writer alive; otherwise the queue fills and every later event is dropped
+                service_logger.exception(f"Failed to write {len(batch)} audit events")
+            
+            if self.dropped_events != reported_drops:
+                service_logger.warning(f"Audit queue full, {self.dropped_events} events dropped so far")
+                reported_drops = self.dropped_events
+    
+    def _write(self, events: List[Dict[str, Any]]):
+        """
+        Format a batch of events and write them with a single flush.
+
+        The batch goes straight to the audit file. Any other handler an
+        event would reach through ``logger.info`` (another handler on this
+        logger or, through propagation, a console handler on the root
+        logger) gets a record per event, as before batching.
+        """
+        # Details may hold values orjson can't serialize (Path, Exception, ...);
+        # default=str writes them as their str()
+        messages = [
+            orjson.dumps(event, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+            for event in events
+        ]
+        
+        # The events of a batch share one log prefix (time, logger, level),
+        # formatted once for the file rather than through a LogRecord per event
+        record = self.logger.makeRecord(self.logger.name, logging.INFO, __file__, 0, "", None, None)
+        prefix = self.handler.format(record)
+        lines = "".join(prefix + message + self.handler.terminator for message in messages)
+        
+        with self.handler.lock:
+            self.handler.stream.write(lines)
+            self.handler.stream.flush()
+        
+        others = [handler for handler in self.logger.handlers if handler is not self.handler]
+        parent = self.logger.parent if self.logger.propagate else None
+        if not others and parent is None:
+            return
+        for message in messages:
+            record = self.logger.makeRecord(self.logger.name, logging.INFO, __file__, 0, message, None, None)
+            for handler in others:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+            if parent is not None:
+                parent.handle(record)
 
 # Create audit logger instance
-audit_logger = AuditLogger() 
\ No newline at end of file
+audit_logger = AuditLogger()
@@ -5,6 +5,7 @@ Pytest configuration file.
 import os
 import tempfile
 import shutil
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
 import logging
@@ -109,10 +110,16 @@ def mock_qdrant_storage(monkeypatch):
             self.stored_chunks = []
             self.collections = []
             
-        def store_chunks(self, chunks):
+        def store_chunks(self, chunks, embeddings):
             self.stored_chunks.extend(chunks)
             return ["mock-id"] * len(chunks)
         
+        async def aupsert_batches(self, chunks, embeddings, batch_size=None, concurrency=None):
+            return self.store_chunks(chunks, embeddings)
+        
+        def flush(self):
+            pass
+        
         def count_by_filters(self, filters=None):
             return len(self.stored_chunks)
         
@@ -127,6 +134,34 @@ def mock_qdrant_storage(monkeypatch):
     return MockQdrantStorage()
 
 
+class RecordingQdrantClient:
+    """Qdrant client that records upserted batches instead of storing them."""
+    
+    def __init__(self):
+        self.upserts = []
+        # Called with each recorded batch, from the thread sending it
+        self.on_upsert = None
+    
+    def collection_exists(self, collection_name):
+        return True
+    
+    def upsert(self, collection_name, points, wait=True):
+        if not points:  # flush() sends an empty upsert
+            return
+        self.upserts.append(points)
+        if self.on_upsert is not None:
+            self.on_upsert(points)
+
+
+@pytest.fixture
+def recording_qdrant_client(monkeypatch):
+    """Give every new QdrantStorage a client that records upserts."""
+    client = RecordingQdrantClient()
+    monkeypatch.setattr("src.storage.QdrantClient", lambda *args, **kwargs: client)
+    monkeypatch.setattr("src.storage._clients", {})
+    return client
+
+
 @pytest.fixture
 def mock_embedder(monkeypatch):
     """Mock the Embedder class."""
@@ -135,10 +170,8 @@ def mock_embedder(monkeypatch):
             pass
             
         def embed_chunks(self, chunks, show_progress=False):
-            # Add fake embeddings to chunks
-            for chunk in chunks:
-                chunk["embedding"] = [0.1, 0.2, 0.3]
-            return chunks
+            # Return fake embeddings, one row per chunk
+            return np.full((len(chunks), 3), 0.1, dtype=np.float32)
         
         def embed_texts(self, texts, show_progress=False):
             # Return fake embeddings
@@ -35,6 +35,30 @@ def test_status_endpoint(client, mock_qdrant_storage):
     assert "storage_usage" in data
 
 
+def test_api_key_required_when_set(client, mock_qdrant_storage, monkeypatch):
+    """Test that endpoints other than the health check need a valid API key once API_KEY is set."""
+    monkeypatch.setattr("src.api.auth._API_KEYS", (b"first-key", b"second-key"))
+    
+    assert client.get("/api/status").status_code == 403
+    assert client.get("/api/status", headers={"X-API-Key": "wrong-key"}).status_code == 403
+    assert client.get("/api/status", headers={"X-API-Key": "second-key"}).status_code == 200
+    assert client.get("/api/health").status_code == 200
+
+
+def test_status_cache_invalidated_after_ingest(client, sample_text_file, mock_embedder, mock_qdrant_storage):
+    """Test that cached status responses are dropped when documents are ingested."""
+    client.get("/api/status")
+    assert routes._status_cache
+    
+    with open(sample_text_file, "rb") as f:
+        client.post(
+            "/api/ingest/file",
+            files={"file": ("test.txt", f.read(), "text/plain")}
+        )
+    
+    assert not routes._status_cache
+
+
 def test_ingest_file_endpoint(client, sample_text_file, mock_embedder, mock_qdrant_storage):
     """Test the ingest file endpoint."""
     # Create a test file
@@ -179,4 +203,107 @@ def test_delete_documents_by_filter_endpoint(client, sample_text_file, mock_embe
     assert response.status_code == 200
     data = response.json()
     assert data["success"] is True
-    assert data["deleted_count"] > 0 
\ No newline at end of file
+    assert data["deleted_count"] > 0
+
+def test_ingest_file_background(client, sample_text_file, mock_embedder, mock_qdrant_storage):
+    """Test ingesting a file in the background and polling its task status."""
+    # Create a test file
+    with open(sample_text_file, "rb") as f:
+        file_content = f.read()
+    
+    # Make the request
+    response = client.post(
+        "/api/ingest/file?background=true",
+        files={"file": ("test.txt", file_content, "text/plain")}
+    )
+    
+    # Check response
+    assert response.status_code == 202
+    data = response.json()
+    assert data["success"] is True
+    assert data["task_id"]
+    
+    # Background tasks have run by the time the test client returns
+    response = client.get(f"/api/status/{data['task_id']}")
+    assert response.status_code == 200
+    task = response.json()
+    assert task["status"] == "completed"
+    assert task["result"]["file_name"] == "test.txt"
+    assert task["result"]["chunks_created"] > 0
+    
+    # Unknown task IDs are reported as not found
+    response = client.get("/api/status/unknown-task")
+    assert response.status_code == 404
+
+
+def test_upload_size_limit_middleware():
+    """Test that uploads declaring a body over the limit are rejected before reading."""
+    from fastapi import FastAPI
+    from src.api.middleware import UploadSizeLimitMiddleware
+    
+    app = FastAPI()
+    
+    @app.post("/upload")
+    async def upload():
+        return {"ok": True}
+    
+    app.add_middleware(UploadSizeLimitMiddleware, paths=["/upload"], max_bytes=10)
+    limited_client = TestClient(app)
+    
+    assert limited_client.post("/upload", content=b"x" * 5).status_code == 200
+    response = limited_client.post("/upload", content=b"x" * 50)
+    assert response.status_code == 413
+    assert "File too large" in response.json()["detail"]
+
+
+def test_rate_limit_exempts_health(client, mock_qdrant_storage, monkeypatch):
+    """Test that health probes are not rate limited or counted."""
+    from collections import OrderedDict
+    from src.api.middleware import rate_limiter
+    from src.config import settings
+    
+    monkeypatch.setattr(settings, "rate_limit_requests", 1)
+    monkeypatch.setattr(rate_limiter, "requests", OrderedDict())
+    
+    for _ in range(3):
+        assert client.get("/api/health").status_code == 200
+    assert client.get("/api/status").status_code == 200
+    assert client.get("/api/status").status_code == 429
+
+
+def test_rate_limited_responses_carry_cors_headers(client, mock_qdrant_storage, monkeypatch):
+    """Test that 429s carry CORS headers and preflight requests aren't rate limited."""
+    from collections import OrderedDict
+    from src.api.middleware import rate_limiter
+    from src.config import settings
+    
+    monkeypatch.setattr(settings, "rate_limit_requests", 1)
+    monkeypatch.setattr(rate_limiter, "requests", OrderedDict())
+    origin = {"Origin": "https://example.com"}
+    
+    for _ in range(3):
+        response = client.options(
+            "/api/status",
+            headers={**origin, "Access-Control-Request-Method": "GET"}
+        )
+        assert response.status_code == 200
+    
+    assert client.get("/api/status", headers=origin).status_code == 200
+    response = client.get("/api/status", headers=origin)
+    assert response.status_code == 429
+    assert "access-control-allow-origin" in response.headers
+
+
+def test_oversized_upload_response_carries_cors_headers(client):
+    """Test that uploads rejected by the size limit still carry CORS headers."""
+    from src.config import settings
+    
+    too_large = str(settings.max_file_size_mb * 1024 * 1024 + (2 << 20))
+    response = client.post(
+        "/api/ingest/file",
+        content=b"",
+        headers={"Origin": "https://example.com", "Content-Length": too_large}
+    )
+    
+    assert response.status_code == 413
+    assert "access-control-allow-origin" in response.headers
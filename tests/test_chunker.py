@@ -4,6 +4,7 @@ Tests for document chunking functionality.
 
 import pytest
 
+import src.chunker as chunker
 from src.chunker import create_chunks, extract_chunk_title
 
 
@@ -110,4 +111,19 @@ def test_extract_chunk_title():
     # Test with empty text
     empty_text = ""
     title = extract_chunk_title(empty_text)
-    assert title == "" 
\ No newline at end of file
+    assert title == ""
+
+
+@pytest.mark.parametrize("use_hyperscan", [True, False])
+def test_extract_chunk_title_header_preference(monkeypatch, use_hyperscan):
+    """Test that header detection gives the same titles with and without hyperscan."""
+    if use_hyperscan and chunker._HEADER_DATABASE is None:
+        pytest.skip("hyperscan is not installed")
+    if not use_hyperscan:
+        monkeypatch.setattr(chunker, "_HEADER_DATABASE", None)
+    
+    # Markdown headers win over earlier HTML headers
+    assert extract_chunk_title("<h2>HTML Header</h2>\n# Markdown Header") == "Markdown Header"
+    assert extract_chunk_title("Intro line\n## Überschrift\nBody") == "Überschrift"
+    assert extract_chunk_title("<h3 class=\"x\">Only HTML</h3> text") == "Only HTML"
+    assert extract_chunk_title("No header. Second sentence.") == "No header."
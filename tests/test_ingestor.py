@@ -2,11 +2,17 @@
 Tests for the ingestor.
 """
 
+import asyncio
 import os
+import threading
+import time
 import pytest
 import io
 
+from src.config import settings
 from src.ingestor import Ingestor
+from src.batching import EmbedQueue
+from src.pipeline import IngestPipeline
 
 
 def test_ingestor_initialization(upload_dir, mock_embedder, mock_qdrant_storage):
@@ -65,6 +71,49 @@ def test_process_html_file(sample_html_file, mock_embedder, mock_qdrant_storage)
     assert len(result["chunk_ids"]) == result["chunks_created"]
 
 
+def test_process_file_encodes_once(sample_text_file, sample_markdown_file, sample_html_file, mock_embedder, mock_qdrant_storage, monkeypatch):
+    """Test that all chunks of a file go through the model in one call."""
+    ingestor = Ingestor()
+    
+    calls = []
+    encode = ingestor.embedder.model.encode
+    
+    def recording_encode(texts, **kwargs):
+        calls.append(len(texts))
+        return encode(texts, **kwargs)
+    
+    # The model is shared across Embedders, so undo the patch after the test
+    monkeypatch.setattr(ingestor.embedder.model, "encode", recording_encode)
+    for file_path in (sample_text_file, sample_markdown_file, sample_html_file):
+        calls.clear()
+        result = ingestor.process_file(file_path)
+        
+        assert result["success"] is True
+        assert calls == [result["chunks_created"]]
+
+
+def test_embedder_warm_up_encodes_full_batch(mock_embedder, mock_qdrant_storage, monkeypatch):
+    """Test that warm-up runs a full batch of texts through the model."""
+    embedder = Ingestor().embedder
+    
+    calls = []
+    encode = embedder.model.encode
+    
+    def recording_encode(texts, **kwargs):
+        calls.append(len(texts))
+        return encode(texts, **kwargs)
+    
+    monkeypatch.setattr(embedder.model, "encode", recording_encode)
+    embedder.warm_up()
+    
+    assert calls == [embedder.batch_size]
+
+
+def test_embedder_model_shared(mock_embedder, mock_qdrant_storage):
+    """Test that ingestors share one loaded embedding model."""
+    assert Ingestor().embedder.model is Ingestor().embedder.model
+
+
 def test_process_unsupported_file(temp_dir, mock_embedder, mock_qdrant_storage):
     """Test processing an unsupported file."""
     # Create an unsupported file
@@ -95,24 +144,48 @@ def test_process_with_additional_metadata(sample_text_file, mock_embedder, mock_
         "tags": ["test", "document"],
     }
     
+    # Record the chunks the ingestor's own storage receives
+    stored = []
+    store_chunks = ingestor.storage.store_chunks
+    
+    def recording_store_chunks(chunks, embeddings):
+        stored.extend(chunks)
+        return store_chunks(chunks, embeddings)
+    
+    ingestor.storage.store_chunks = recording_store_chunks
+    
     # Process the file with metadata
     result = ingestor.process_file(sample_text_file, metadata=metadata)
     
     # Check the result
     assert result["success"] is True
     
-    # Check if metadata was included in the chunks
-    storage = mock_qdrant_storage
-    for chunk in storage.stored_chunks:
-        assert chunk["metadata"]["source"] == "test"
-        assert chunk["metadata"]["category"] == "documentation"
-        assert chunk["metadata"]["tags"] == ["test", "document"]
+    # Check if metadata was included in every stored chunk
+    assert len(stored) == result["chunks_created"]
+    assert {chunk["metadata"]["source"] for chunk in stored} == {"test"}
+    assert {chunk["metadata"]["category"] for chunk in stored} == {"documentation"}
+    assert all(chunk["metadata"]["tags"] == ["test", "document"] for chunk in stored)
 
 
 def test_process_files(sample_text_file, sample_markdown_file, mock_embedder, mock_qdrant_storage):
     """Test processing multiple files."""
     ingestor = Ingestor()
     
+    calls = {"embed": 0, "store": 0}
+    embed_chunks = ingestor.embedder.embed_chunks
+    store_chunks = ingestor.storage.store_chunks
+    
+    def counting_embed_chunks(chunks, show_progress=True):
+        calls["embed"] += 1
+        return embed_chunks(chunks, show_progress)
+    
+    def counting_store_chunks(chunks, embeddings):
+        calls["store"] += 1
+        return store_chunks(chunks, embeddings)
+    
+    ingestor.embedder.embed_chunks = counting_embed_chunks
+    ingestor.storage.store_chunks = counting_store_chunks
+    
     # Process multiple files
     results = ingestor.process_files([sample_text_file, sample_markdown_file])
     
@@ -122,8 +195,133 @@ def test_process_files(sample_text_file, sample_markdown_file, mock_embedder, mo
     assert results[1]["success"] is True
     assert results[0]["file_name"] == os.path.basename(sample_text_file)
     assert results[1]["file_name"] == os.path.basename(sample_markdown_file)
+    
+    # Both files' chunks go through one embedding call and one store
+    assert calls == {"embed": 1, "store": 1}
+
 
 
+def test_process_files_keeps_files_when_flush_fails(sample_text_file, sample_markdown_file, mock_embedder, mock_qdrant_storage, monkeypatch):
+    """Test that files are only deleted after their chunks are applied."""
+    ingestor = Ingestor()
+    flush = ingestor.storage.flush
+    failing = True
+    
+    def failing_flush():
+        if failing:
+            raise RuntimeError("Qdrant unavailable")
+        flush()
+    
+    monkeypatch.setattr(ingestor.storage, "flush", failing_flush)
+    results = ingestor.process_files([sample_text_file, sample_markdown_file], delete_after=True)
+    
+    assert [result["success"] for result in results] == [False, False]
+    assert os.path.exists(sample_text_file) and os.path.exists(sample_markdown_file)
+    
+    failing = False
+    results = ingestor.process_files([sample_text_file, sample_markdown_file], delete_after=True)
+    
+    assert [result["success"] for result in results] == [True, True]
+    assert not os.path.exists(sample_text_file) and not os.path.exists(sample_markdown_file)
+
+
+def test_process_files_batches_embeddings(temp_dir, sample_text_file, sample_markdown_file, mock_embedder, mock_qdrant_storage):
+    """Test that chunks from several files are embedded together."""
+    ingestor = Ingestor()
+    unsupported_file = os.path.join(temp_dir, "test.xyz")
+    with open(unsupported_file, "w") as f:
+        f.write("This is an unsupported file type")
+    
+    calls = []
+    embed_chunks = ingestor.embedder.embed_chunks
+    
+    def recording_embed_chunks(chunks, show_progress=True):
+        calls.append(len(chunks))
+        return embed_chunks(chunks, show_progress)
+    
+    ingestor.embedder.embed_chunks = recording_embed_chunks
+    results = ingestor.process_files([sample_text_file, unsupported_file, sample_markdown_file])
+    
+    # The unsupported file fails on its own; the others share one embedding call
+    assert [result["success"] for result in results] == [True, False, True]
+    assert calls == [results[0]["chunks_created"] + results[2]["chunks_created"]]
+    for result in (results[0], results[2]):
+        assert len(result["chunk_ids"]) == result["chunks_created"]
+        assert result["processing_time"] is not None
+
+def test_process_files_embeds_repeated_chunks_once(temp_dir, mock_embedder, mock_qdrant_storage, monkeypatch):
+    """Test that chunks with the same text in several files are encoded once."""
+    file_paths = []
+    for name in ("first.txt", "second.txt"):
+        file_path = os.path.join(temp_dir, name)
+        with open(file_path, "w") as f:
+            f.write("The same boilerplate text in every file.")
+        file_paths.append(file_path)
+    ingestor = Ingestor()
+    
+    calls = []
+    encode = ingestor.embedder.model.encode
+    
+    def recording_encode(texts, **kwargs):
+        calls.append(list(texts))
+        return encode(texts, **kwargs)
+    
+    monkeypatch.setattr(ingestor.embedder.model, "encode", recording_encode)
+    stored = []
+    store_chunks = ingestor.storage.store_chunks
+    
+    def recording_store_chunks(chunks, embeddings):
+        stored.append(embeddings)
+        return store_chunks(chunks, embeddings)
+    
+    ingestor.storage.store_chunks = recording_store_chunks
+    results = ingestor.process_files(file_paths)
+    
+    assert [result["success"] for result in results] == [True, True]
+    assert calls == [["The same boilerplate text in every file."]]
+    assert len(stored) == 1 and len(stored[0]) == 2
+    assert (stored[0][0] == stored[0][1]).all()
+
+
+def test_process_files_in_processes(temp_dir, sample_text_file, sample_markdown_file, sample_html_file, mock_embedder, mock_qdrant_storage, monkeypatch):
+    """Test that files extracted in worker processes come back in input order."""
+    unsupported_file = os.path.join(temp_dir, "test.xyz")
+    with open(unsupported_file, "w") as f:
+        f.write("This is an unsupported file type")
+    file_paths = [sample_html_file, sample_text_file, unsupported_file, sample_markdown_file]
+    ingestor = Ingestor()
+    
+    monkeypatch.setattr(settings, "extract_processes", 1)
+    serial = ingestor.process_files(file_paths)
+    monkeypatch.setattr(settings, "extract_processes", 2)
+    parallel = ingestor.process_files(file_paths)
+    
+    assert [result["file_path"] for result in parallel] == file_paths
+    assert [result["success"] for result in parallel] == [True, True, False, True]
+    for serial_result, parallel_result in zip(serial, parallel):
+        assert parallel_result.get("chunks_created") == serial_result.get("chunks_created")
+        assert parallel_result.get("chunk_ids") == serial_result.get("chunk_ids")
+
+
+def test_process_files_batches_upserts(sample_text_file, sample_markdown_file, mock_embedder, mock_qdrant_storage, monkeypatch):
+    """Test that embedded chunks from several batches are stored in one upsert."""
+    ingestor = Ingestor()
+    monkeypatch.setattr(settings.embedding, "microbatch_size", 1)
+    
+    calls = []
+    store_chunks = ingestor.storage.store_chunks
+    
+    def recording_store_chunks(chunks, embeddings):
+        calls.append(len(chunks))
+        return store_chunks(chunks, embeddings)
+    
+    ingestor.storage.store_chunks = recording_store_chunks
+    results = ingestor.process_files([sample_text_file, sample_markdown_file])
+    
+    assert calls == [results[0]["chunks_created"] + results[1]["chunks_created"]]
+    for result in results:
+        assert len(result["chunk_ids"]) == result["chunks_created"]
+
 @pytest.mark.asyncio
 async def test_process_upload(temp_dir, mock_embedder, mock_qdrant_storage):
     """Test processing an uploaded file."""
@@ -142,6 +340,111 @@ async def test_process_upload(temp_dir, mock_embedder, mock_qdrant_storage):
     assert result["chunks_created"] > 0
 
 
+@pytest.mark.asyncio
+async def test_process_upload_unsupported(mock_embedder, mock_qdrant_storage):
+    """Test that an unsupported upload is rejected without being saved."""
+    ingestor = Ingestor()
+    
+    def save_upload(file_obj, filename):
+        raise AssertionError("unsupported upload was saved")
+    
+    ingestor.save_upload = save_upload
+    result = await ingestor.process_upload(io.BytesIO(b"Unsupported file type"), "upload.xyz")
+    
+    assert result["success"] is False
+    assert result["file_name"] == "upload.xyz"
+    assert "Unsupported file type" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_process_upload_batches_concurrently(mock_embedder, recording_qdrant_client, monkeypatch):
+    """Test that the upserts of a large upload are in flight together."""
+    lock = threading.Lock()
+    in_flight = {"now": 0, "max": 0}
+    # Set once two upserts run at the same time; each upsert waits for it, so
+    # concurrent upserts are seen however slowly the threads are scheduled
+    overlapped = threading.Event()
+    
+    def on_upsert(points):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            if in_flight["now"] >= 2:
+                overlapped.set()
+        overlapped.wait(timeout=5)
+        with lock:
+            in_flight["now"] -= 1
+    
+    recording_qdrant_client.on_upsert = on_upsert
+    monkeypatch.setattr(settings.qdrant, "upsert_batch_size", 2)
+    monkeypatch.setattr(settings.qdrant, "upsert_concurrency", 2)
+    monkeypatch.setattr(settings.chunking, "chunk_size", 100)
+    monkeypatch.setattr(settings.chunking, "chunk_overlap", 0)
+    ingestor = Ingestor()
+    
+    file_obj = io.BytesIO(("Some words for a larger upload. " * 40).encode("utf-8"))
+    result = await ingestor.process_upload(file_obj, "large_upload.txt")
+    
+    assert result["success"] is True
+    assert in_flight["max"] >= 2
+
+
+@pytest.mark.asyncio
+async def test_process_upload_stores_while_embedding(mock_embedder, mock_qdrant_storage, monkeypatch):
+    """Test that an upload's first chunks are stored before the last ones are embedded."""
+    monkeypatch.setattr(settings.chunking, "chunk_size", 100)
+    monkeypatch.setattr(settings.chunking, "chunk_overlap", 0)
+    monkeypatch.setattr(settings.embedding, "microbatch_size", 2)
+    ingestor = Ingestor()
+    
+    events = []
+    embed_chunks = ingestor.embedder.embed_chunks
+    aupsert_batches = ingestor.storage.aupsert_batches
+    
+    def recording_embed_chunks(chunks, show_progress=True):
+        time.sleep(0.02)
+        events.append("embed")
+        return embed_chunks(chunks, show_progress)
+    
+    async def recording_aupsert_batches(chunks, embeddings):
+        events.append("store")
+        return await aupsert_batches(chunks, embeddings)
+    
+    ingestor.embedder.embed_chunks = recording_embed_chunks
+    ingestor.storage.aupsert_batches = recording_aupsert_batches
+    
+    file_obj = io.BytesIO(("Some words for a larger upload. " * 40).encode("utf-8"))
+    result = await ingestor.process_upload(file_obj, "large_upload.txt")
+    
+    assert result["success"] is True
+    assert len(result["chunk_ids"]) == result["chunks_created"]
+    assert events.index("store") < len(events) - 1 - events[::-1].index("embed")
+
+
+@pytest.fixture(params=[1, 8, 32, 128, 512])
+def qdrant_batch_size(request):
+    """Points per Qdrant upsert."""
+    return request.param
+
+
+def test_process_file_upsert_batch_size(sample_text_file, mock_embedder, recording_qdrant_client, qdrant_batch_size, monkeypatch):
+    """Test that stored chunks are sent in upserts of the configured size."""
+    monkeypatch.setattr(settings.chunking, "chunk_size", 100)
+    monkeypatch.setattr(settings.chunking, "chunk_overlap", 0)
+    ingestor = Ingestor(qdrant_batch_size=qdrant_batch_size)
+    
+    with open(sample_text_file, "w") as f:
+        f.write("Some words for a larger document. " * 300)
+    result = ingestor.process_file(sample_text_file)
+    
+    assert result["success"] is True
+    chunks = result["chunks_created"]
+    upserts = [len(points.ids) for points in recording_qdrant_client.upserts]
+    assert sum(upserts) == chunks
+    assert len(upserts) == -(-chunks // qdrant_batch_size)
+    assert max(upserts) == min(qdrant_batch_size, chunks)
+
+
 def test_delete_document(sample_text_file, mock_embedder, mock_qdrant_storage):
     """Test deleting a document."""
     ingestor = Ingestor()
@@ -163,4 +466,73 @@ def test_delete_document(sample_text_file, mock_embedder, mock_qdrant_storage):
     # Check the result
     assert result["success"] is False
     assert result["deleted_count"] == 0
-    assert "error" in result 
\ No newline at end of file
+    assert "error" in result
+
+
+def test_ingest_pipeline(sample_text_file, sample_markdown_file, mock_embedder, mock_qdrant_storage):
+    """Test ingesting several uploads through the staged pipeline."""
+    ingestor = Ingestor()
+    
+    with open(sample_text_file, "rb") as f:
+        text_content = f.read()
+    with open(sample_markdown_file, "rb") as f:
+        markdown_content = f.read()
+    
+    # Use a small micro-batch so embedding batches span both files
+    ingestor.embed_queue.batch_size = 2
+    ingestor.upsert_queue.batch_size = 3
+    
+    # Chunks go through the ingestor's shared queues
+    queued = []
+    embed = ingestor.embed_queue.embed
+    
+    async def recording_embed(chunks):
+        queued.extend(chunks)
+        return await embed(chunks)
+    
+    ingestor.embed_queue.embed = recording_embed
+    pipeline = IngestPipeline(ingestor, workers=2)
+    results = asyncio.run(pipeline.run([
+        (text_content, "test.txt"),
+        (b"not a document", "test.xyz"),
+        (io.BytesIO(markdown_content), "test.md"),
+    ]))
+    
+    # Results are returned in upload order
+    assert [result["file_name"] for result in results] == ["test.txt", "test.xyz", "test.md"]
+    assert results[0]["success"] is True
+    assert results[0]["chunks_created"] == len(results[0]["chunk_ids"]) > 0
+    assert results[1]["success"] is False
+    assert "Unsupported file type" in results[1]["error"]
+    assert results[2]["success"] is True
+    assert results[2]["chunks_created"] > 0
+    assert len(queued) == results[0]["chunks_created"] + results[2]["chunks_created"]
+    
+    # Temporary copies of the uploads are removed
+    for result in results:
+        assert not os.path.exists(os.path.dirname(result["file_path"]))
+
+
+def test_embed_queue_batches_across_callers(mock_embedder):
+    """Test that chunks submitted by concurrent callers share embedding calls."""
+    calls = []
+    
+    class RecordingEmbedder:
+        def embed_chunks(self, chunks, show_progress=False):
+            calls.append(len(chunks))
+            return mock_embedder.embed_chunks(chunks)
+    
+    queue = EmbedQueue(RecordingEmbedder(), batch_size=4, timeout=0.01)
+    
+    async def embed_all():
+        return await asyncio.gather(
+            queue.embed([{"text": "a"}] * 3),
+            queue.embed([{"text": "b"}] * 2),
+            queue.embed([{"text": "c"}])
+        )
+    
+    results = asyncio.run(embed_all())
+    
+    # Each caller gets one row per chunk, from batches of at most 4 chunks
+    assert [len(result) for result in results] == [3, 2, 1]
+    assert calls == [4, 2]
@@ -0,0 +1,95 @@
+"""
+Tests for the rate limiter and its request windows.
+"""
+
+import asyncio
+
+from src.api.middleware import RateLimiter, RequestWindow, _INITIAL_WINDOW_SLOTS
+from src.config import settings
+
+
+def _window(*timestamps):
+    """Build a request window holding the given timestamps."""
+    window = RequestWindow()
+    for timestamp in timestamps:
+        window.append(timestamp)
+    return window
+
+
+def _live(window):
+    """Return the timestamps a window holds, oldest first."""
+    return list(window.times[window.head:window.head + window.count])
+
+
+def test_request_window_eviction_boundary():
+    """Test that timestamps at the cutoff are dropped and later ones kept."""
+    window = _window(1.0, 2.0, 2.0, 3.0, 4.0)
+    
+    window.evict_until(2.0)
+    assert _live(window) == [3.0, 4.0]
+    assert window.newest() == 4.0
+    
+    window.evict_until(1.0)
+    assert _live(window) == [3.0, 4.0]
+    
+    window.evict_until(10.0)
+    assert len(window) == 0
+    window.evict_until(11.0)
+    assert len(window) == 0
+
+
+def test_request_window_compacts_when_mostly_expired():
+    """Test that a full buffer holding few live timestamps is compacted in place."""
+    window = _window(*range(_INITIAL_WINDOW_SLOTS))
+    times = window.times
+    window.evict_until(_INITIAL_WINDOW_SLOTS - 3)
+    
+    window.append(_INITIAL_WINDOW_SLOTS)
+    
+    assert window.times is times
+    assert window.head == 0
+    assert _live(window) == [_INITIAL_WINDOW_SLOTS - 2, _INITIAL_WINDOW_SLOTS - 1, _INITIAL_WINDOW_SLOTS]
+
+
+def test_request_window_grows_when_mostly_live():
+    """Test that a full buffer holding mostly live timestamps doubles in size."""
+    window = _window(*range(_INITIAL_WINDOW_SLOTS))
+    window.evict_until(0)
+    
+    window.append(_INITIAL_WINDOW_SLOTS)
+    
+    assert len(window.times) == 2 * _INITIAL_WINDOW_SLOTS
+    assert window.head == 0
+    assert _live(window) == list(range(1, _INITIAL_WINDOW_SLOTS + 1))
+
+
+def test_rate_limiter_limits_ip_and_api_key(monkeypatch):
+    """Test that the in-memory limiter counts requests per IP and per API key."""
+    monkeypatch.setattr(settings, "rate_limit_requests", 2)
+    limiter = RateLimiter()
+    
+    async def check(client_ip, api_key=""):
+        return (await limiter.check_rate_limit(client_ip, api_key))[0]
+    
+    assert asyncio.run(check("10.0.0.1", "key")) is False
+    assert asyncio.run(check("10.0.0.1", "key")) is False
+    assert asyncio.run(check("10.0.0.1", "key")) is True
+    assert asyncio.run(check("10.0.0.2", "key")) is True
+    assert asyncio.run(check("10.0.0.2")) is False
+
+
+def test_rate_limiter_remove_stale(monkeypatch):
+    """Test that clients without requests inside the window are dropped."""
+    monkeypatch.setattr(settings, "rate_limit_window", 60)
+    limiter = RateLimiter()
+    limiter.requests["idle"] = _window(100.0)
+    limiter.requests["active"] = _window(100.0, 150.0)
+    limiter.requests["empty"] = RequestWindow()
+    limiter.api_key_requests["key"] = _window(100.0)
+    
+    assert limiter.remove_stale(current_time=160.0) == 3
+    assert list(limiter.requests) == ["active"]
+    assert not limiter.api_key_requests
+    
+    assert limiter.remove_stale(current_time=210.0) == 1
+    assert not limiter.requests
@@ -9,6 +9,7 @@ from src.processors.factory import get_processor
 from src.processors.text import TextProcessor
 from src.processors.markdown import MarkdownProcessor
 from src.processors.html import HTMLProcessor
+from src.processors.docx import DocxProcessor
 
 
 def test_text_processor(sample_text_file):
@@ -69,6 +70,14 @@ def test_markdown_processor(sample_markdown_file):
     assert metadata["word_count"] > 0
 
 
+def test_markdown_processor_strict(sample_markdown_file):
+    """Test the markdown processor's HTML rendering mode."""
+    processor = MarkdownProcessor(sample_markdown_file, strict=True)
+    
+    # Rendered to HTML, the text matches the default syntax stripping
+    assert processor.extract_text() == get_processor(sample_markdown_file).extract_text()
+
+
 def test_html_processor(sample_html_file):
     """Test the HTML processor."""
     # Get the processor
@@ -102,6 +111,25 @@ def test_html_processor(sample_html_file):
     assert metadata["word_count"] > 0
 
 
+
+def test_markdown_frontmatter(temp_dir):
+    """Test that Markdown frontmatter is parsed as YAML."""
+    file_path = os.path.join(temp_dir, "frontmatter.md")
+    with open(file_path, "w") as f:
+        f.write("---\n")
+        f.write("Title: \"Notes: part 1\"\n")
+        f.write("tags: [alpha, beta]\n")
+        f.write("date: 2024-01-02\n")
+        f.write("---\n")
+        f.write("# Heading\n\nBody text.\n")
+    
+    metadata = MarkdownProcessor(file_path).extract_metadata()
+    
+    # Keys are lowercased, quoted colons and lists survive, dates become strings
+    assert metadata["title"] == "Notes: part 1"
+    assert metadata["tags"] == ["alpha", "beta"]
+    assert metadata["date"] == "2024-01-02"
+
 def test_processor_factory(sample_text_file, sample_markdown_file, sample_html_file):
     """Test the processor factory."""
     # Get processors for different file types
@@ -126,6 +154,117 @@ def test_processor_factory(sample_text_file, sample_markdown_file, sample_html_f
     assert processor is None
 
 
+def test_docx_processor(temp_dir):
+    """Test the DOCX processor on paragraphs, runs, nested tables and core properties."""
+    import docx
+    from datetime import datetime, timezone
+    
+    document = docx.Document()
+    document.core_properties.title = "Quarterly Report"
+    document.core_properties.author = "Jane Doe"
+    document.core_properties.created = datetime(2024, 1, 2, 3, 4, 5)
+    document.add_paragraph("First paragraph.")
+    run = document.add_paragraph("Name:").add_run()
+    run.add_tab()
+    run.add_text("Value")
+    run.add_break()
+    run.add_text("Next line")
+    document.add_paragraph("")
+    table = document.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "Cell A"
+    table.cell(0, 1).text = "Cell B"
+    table.cell(0, 1).add_table(rows=1, cols=1).cell(0, 0).text = "Nested cell"
+    document.add_paragraph("Closing paragraph.")
+    file_path = os.path.join(temp_dir, "report.docx")
+    document.save(file_path)
+    
+    processor = get_processor(file_path)
+    assert isinstance(processor, DocxProcessor)
+    
+    # Tables come in document order, a nested table inside its cell's text;
+    # empty body paragraphs are skipped
+    assert processor.extract_text() == (
+        "First paragraph.\n"
+        "Name:\tValue\nNext line\n"
+        "Cell A\n"
+        "Cell B\nNested cell\n\n"
+        "Closing paragraph."
+    )
+    
+    metadata = processor.extract_metadata()
+    assert metadata["file_type"] == "docx"
+    assert metadata["filename"] == "report.docx"
+    assert metadata["title"] == "Quarterly Report"
+    assert metadata["author"] == "Jane Doe"
+    assert metadata["created"] == datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    
+    # Counts match python-docx: body paragraphs (empty ones included) and top-level tables
+    assert metadata["paragraph_count"] == 4
+    assert metadata["table_count"] == 1
+    assert metadata["word_count"] == 14
+
+
+def test_processor_reuses_extraction(sample_text_file, monkeypatch):
+    """Test that an unchanged file is read once when processed again."""
+    opened = []
+    real_open = open
+    
+    def counting_open(file, *args, **kwargs):
+        if file == sample_text_file:
+            opened.append(file)
+        return real_open(file, *args, **kwargs)
+    
+    monkeypatch.setattr("builtins.open", counting_open)
+    first = get_processor(sample_text_file)
+    text, metadata = first.extract_text(), first.extract_metadata()
+    second = get_processor(sample_text_file)
+    
+    assert second.extract_text() == text
+    assert second.extract_metadata() == metadata
+    assert len(opened) == 1
+    
+    # Callers can add to the metadata without changing the cached copy
+    second.extract_metadata()["tags"] = ["changed"]
+    assert "tags" not in get_processor(sample_text_file).extract_metadata()
+    
+    # A changed file is read again
+    with real_open(sample_text_file, "a") as f:
+        f.write("\nA fourth line.")
+    assert "A fourth line." in get_processor(sample_text_file).extract_text()
+    assert len(opened) == 2
+
+
+def test_processor_extraction_cache_bounded_by_size(temp_dir, monkeypatch):
+    """Test that cached texts are evicted once their total length exceeds the limit."""
+    file_paths = []
+    for name in ("first.txt", "second.txt"):
+        file_path = os.path.join(temp_dir, name)
+        with open(file_path, "w") as f:
+            f.write(f"The text of {name}.")
+        file_paths.append(file_path)
+    
+    opened = []
+    real_open = open
+    
+    def counting_open(file, *args, **kwargs):
+        if file in file_paths:
+            opened.append(file)
+        return real_open(file, *args, **kwargs)
+    
+    monkeypatch.setattr("builtins.open", counting_open)
+    # Room for one of the texts only
+    monkeypatch.setattr("src.processors.base.EXTRACTED_CACHE_MAX_CHARS", len("The text of second.txt."))
+    for file_path in file_paths:
+        processor = get_processor(file_path)
+        processor.extract_text()
+        processor.extract_metadata()
+    
+    get_processor(file_paths[1]).extract_text()
+    assert opened == file_paths
+    get_processor(file_paths[0]).extract_text()
+    assert opened == file_paths + file_paths[:1]
+
+
 def test_processor_file_not_found():
     """Test handling of non-existent files."""
     with pytest.raises(FileNotFoundError):
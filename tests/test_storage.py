@@ -0,0 +1,64 @@
+"""
+Tests for the Qdrant storage helpers.
+"""
+
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as rest
+
+from src.storage import QdrantStorage
+
+
+def test_build_filter_scalar():
+    """Test that a scalar value must match exactly."""
+    condition, = QdrantStorage._build_filter({"filename": "report.pdf"}).must
+    
+    assert condition.key == "metadata.filename"
+    assert condition.match == rest.MatchValue(value="report.pdf")
+
+
+def test_build_filter_list():
+    """Test that a list or tuple matches any of its items in one condition."""
+    for values in (["a.pdf", "b.pdf"], ("a.pdf", "b.pdf")):
+        condition, = QdrantStorage._build_filter({"filename": values}).must
+    
+        assert condition.key == "metadata.filename"
+        assert condition.match == rest.MatchAny(any=["a.pdf", "b.pdf"])
+
+
+def test_build_filter_combines_fields():
+    """Test that conditions on several fields are combined with AND."""
+    conditions = QdrantStorage._build_filter({"filename": "a.pdf", "author": ["Ann", "Bob"]}).must
+    
+    assert [condition.key for condition in conditions] == ["metadata.filename", "metadata.author"]
+
+
+@pytest.mark.parametrize("filters, expected", [
+    ({"filename": "a.pdf"}, {1}),
+    ({"filename": ["a.pdf", "c.pdf"]}, {1, 3}),
+    ({"filename": []}, set()),
+])
+def test_build_filter_matches(filters, expected):
+    """Test which points the built filters select, including an empty list matching nothing."""
+    client = QdrantClient(location=":memory:")
+    if client.collection_exists("filters"):
+        client.delete_collection("filters")
+    client.create_collection(
+        collection_name="filters",
+        vectors_config=rest.VectorParams(size=2, distance=rest.Distance.COSINE)
+    )
+    client.upsert(
+        collection_name="filters",
+        points=[
+            rest.PointStruct(id=point_id, vector=[1.0, 0.0], payload={"metadata": {"filename": filename}})
+            for point_id, filename in ((1, "a.pdf"), (2, "b.pdf"), (3, "c.pdf"))
+        ]
+    )
+    
+    points, _ = client.scroll(
+        collection_name="filters",
+        scroll_filter=QdrantStorage._build_filter(filters),
+        limit=10
+    )
+    
+    assert {point.id for point in points} == expected